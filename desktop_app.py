@@ -40,6 +40,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from src.core.event_loop import install_uvloop
 from src.core.events import EventType
 from io_layer.progress_publisher import ProgressEventType
 from io_layer.native_file_browser import NativeFileBrowser
@@ -681,6 +682,9 @@ class LLMAgentDesktopApp:
         self.root.mainloop()
 
 def main():
+    # Worker threads create their loops with asyncio.new_event_loop(), which
+    # follows the installed policy.
+    install_uvloop()
     try:
         app = LLMAgentDesktopApp()
         app.run()
@@ -73,8 +73,13 @@ class BaseAgent(ABC):
         self.config = config
         self.agent_id = config.agent_id
         self.event_bus = shared_event_bus or EventBus(config.event_bus_db_path)
+        self._owns_event_bus = shared_event_bus is None
         self.coordination = CoordinationManager(config.event_bus_db_path)
         self.running = False
+        # Set whenever the agent stops running, so callers can await shutdown.
+        self.done_event = asyncio.Event()
+        # Set once start() is about to enter the run loop.
+        self.ready = asyncio.Event()
 
         if not config.gemini_api_key:
             logger.error(
@@ -92,6 +97,7 @@ class BaseAgent(ABC):
         await self.event_bus.initialize()
         await self.setup_event_subscriptions()
         self.running = True
+        self.done_event.clear()
         # logger.debug(f"Agent {self.agent_id} initialized and subscriptions set up.")
 
     async def start(self):
@@ -103,6 +109,7 @@ class BaseAgent(ABC):
             await self.initialize_agent()
 
         if self.running:
+            self.ready.set()
             await self.run()
         else:
             logger.error(
@@ -111,6 +118,15 @@ class BaseAgent(ABC):
 
     async def stop(self):
         self.running = False
+        self.ready.clear()
+        self.done_event.set()
+
+    async def close(self):
+        """Release this agent's database connections and event subscriptions."""
+        self.event_bus.unsubscribe_all(self)
+        await self.coordination.close()
+        if self._owns_event_bus:
+            await self.event_bus.close()
 
     @abstractmethod
     async def setup_event_subscriptions(self):
@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from typing import Dict, Any, List
 from pathlib import Path
 import pathspec
@@ -12,6 +13,10 @@ from core.coordination import Chunk, ChunkStatus
 from core.logger import logger
 
 
+EVENT_RETENTION_DAYS = 7
+EVENT_PRUNE_INTERVAL_SECONDS = 3600
+
+
 class CoordinatorAgent(BaseAgent):
     def __init__(
         self, config: AgentConfig, target_repo_path: str, shared_event_bus=None
@@ -22,6 +27,7 @@ class CoordinatorAgent(BaseAgent):
         self.current_feature_spec = None
         self.current_feature_id = None
         self.chunks_created = False
+        self._last_event_prune = float("-inf")
 
     async def setup_event_subscriptions(self):
         self.event_bus.subscribe(
@@ -59,6 +65,7 @@ class CoordinatorAgent(BaseAgent):
                         )
 
             await self.coordinate_merging()
+            await self.prune_old_events()
 
             if await self.is_feature_complete():
                 logger.info("🎉 All chunks completed! Feature implementation finished.")
@@ -77,6 +84,22 @@ class CoordinatorAgent(BaseAgent):
 
             await asyncio.sleep(5)
 
+    async def prune_old_events(self):
+        """Sweep expired rows from the events table at most once per interval."""
+        now = time.monotonic()
+        if now - self._last_event_prune < EVENT_PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_event_prune = now
+
+        try:
+            removed = await self.coordination.prune_events(EVENT_RETENTION_DAYS)
+            if removed:
+                logger.info(
+                    f"🧹 Pruned {removed} events older than {EVENT_RETENTION_DAYS} days"
+                )
+        except Exception as e:
+            logger.warning(f"Could not prune old events: {e}")
+
     async def start_feature_processing(self, feature_specification: str):
         logger.debug(f"start_feature_processing called with: {feature_specification}")
 
@@ -224,30 +247,33 @@ class CoordinatorAgent(BaseAgent):
             return
 
         created_chunk_ids = []
-        for i, plan in enumerate(chunk_plans):
-            unique_chunk_id = f"{self.current_feature_id}_{plan.chunk_id}"
-
-            prefixed_dependencies = []
-            for dep in plan.dependencies:
-                if dep.startswith(self.current_feature_id):
-                    prefixed_dependencies.append(dep)
-                else:
-                    prefixed_dependencies.append(f"{self.current_feature_id}_{dep}")
+        async with self.coordination.transaction() as tx:
+            for i, plan in enumerate(chunk_plans):
+                unique_chunk_id = f"{self.current_feature_id}_{plan.chunk_id}"
+
+                prefixed_dependencies = []
+                for dep in plan.dependencies:
+                    if dep.startswith(self.current_feature_id):
+                        prefixed_dependencies.append(dep)
+                    else:
+                        prefixed_dependencies.append(
+                            f"{self.current_feature_id}_{dep}"
+                        )
 
-            logger.debug(
-                f"Creating chunk {unique_chunk_id} with dependencies: {prefixed_dependencies}"
-            )
+                logger.debug(
+                    f"Creating chunk {unique_chunk_id} with dependencies: {prefixed_dependencies}"
+                )
 
-            chunk = Chunk(
-                chunk_id=unique_chunk_id,
-                description=plan.description,
-                status=ChunkStatus.PLANNED,
-                files=plan.files,
-                dependencies=prefixed_dependencies,
-                pr_number=None,
-            )
-            await self.coordination.create_chunk(chunk)
-            created_chunk_ids.append(unique_chunk_id)
+                chunk = Chunk(
+                    chunk_id=unique_chunk_id,
+                    description=plan.description,
+                    status=ChunkStatus.PLANNED,
+                    files=plan.files,
+                    dependencies=prefixed_dependencies,
+                    pr_number=None,
+                )
+                await tx.create_chunk(chunk)
+                created_chunk_ids.append(unique_chunk_id)
 
         await self.publish_event(
             EventType.CHUNKS_PLANNED,
@@ -320,21 +346,29 @@ class CoordinatorAgent(BaseAgent):
         ]
         merged_ids = {c.chunk_id for c in merged_chunks}
 
-        for chunk in completed_chunks:
-            deps_merged = all(dep_id in merged_ids for dep_id in chunk.dependencies)
-
-            if deps_merged and chunk.pr_number:
-                logger.info(
-                    f"Chunk {chunk.chunk_id} ready to merge (dependencies satisfied)"
+        # Chunks merged in this pass are marked MERGED together in one commit
+        # rather than one transaction each; the finally keeps the ones already
+        # merged recorded if a later merge request fails.
+        newly_merged = []
+        try:
+            for chunk in completed_chunks:
+                deps_merged = all(
+                    dep_id in merged_ids for dep_id in chunk.dependencies
                 )
 
-                await self.merge_pr(chunk.chunk_id, chunk.pr_number)
+                if deps_merged and chunk.pr_number:
+                    logger.info(
+                        f"Chunk {chunk.chunk_id} ready to merge (dependencies satisfied)"
+                    )
 
-                await self.coordination.update_chunk_status(
-                    chunk.chunk_id, ChunkStatus.MERGED
-                )
+                    await self.merge_pr(chunk.chunk_id, chunk.pr_number)
 
-                merged_ids.add(chunk.chunk_id)
+                    newly_merged.append(chunk.chunk_id)
+                    merged_ids.add(chunk.chunk_id)
+        finally:
+            await self.coordination.update_chunk_statuses(
+                newly_merged, ChunkStatus.MERGED
+            )
 
     async def merge_pr(self, chunk_id: str, pr_number: int):
 
@@ -446,14 +480,10 @@ class CoordinatorAgent(BaseAgent):
 
     async def get_status(self) -> Dict[str, Any]:
 
-        all_chunks = await self.coordination.get_chunks()
-
-        status_counts = {}
-        for chunk in all_chunks:
-            status_counts[chunk.status] = status_counts.get(chunk.status, 0) + 1
+        status_counts = await self.coordination.get_chunk_status_counts()
 
         return {
-            "total_chunks": len(all_chunks),
+            "total_chunks": sum(status_counts.values()),
             "status_breakdown": status_counts,
             "chunks_created": self.chunks_created,
             "current_feature_active": self.current_feature_id is not None,
@@ -1,7 +1,15 @@
 import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+
+GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+MODELS_CACHE_TTL_SECONDS = 300
+
+_session: Optional[Any] = None
+_models_cache: Dict[str, Tuple[float, List[str]]] = {}
 
 
 def get_config_dir() -> Path:
@@ -75,18 +83,43 @@ def get_api_key() -> str:
     return api_key
 
 
-def fetch_available_models() -> List[str]:
+def get_http_session():
+    """Shared HTTP session so repeated Gemini API calls reuse keep-alive connections."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        _session = session
+    return _session
+
+
+def fetch_available_models(force_refresh: bool = False) -> List[str]:
+    """Return the Gemini models available to the configured API key.
+
+    Successful results are cached per key for MODELS_CACHE_TTL_SECONDS, so
+    reopening the settings dialog does not refetch; `force_refresh` skips it.
+    """
     api_key = get_api_key()
     if not api_key:
         return get_default_models()
 
-    try:
-        import requests
+    cached = _models_cache.get(api_key)
+    if (
+        not force_refresh
+        and cached
+        and time.monotonic() - cached[0] < MODELS_CACHE_TTL_SECONDS
+    ):
+        return list(cached[1])
 
-        url = "https://generativelanguage.googleapis.com/v1beta/models"
+    try:
         headers = {"x-goog-api-key": api_key}
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(
+            GEMINI_MODELS_URL, headers=headers, timeout=10
+        )
         response.raise_for_status()
 
         data = response.json()
@@ -108,7 +141,8 @@ def fetch_available_models() -> List[str]:
         if gemini_models:
 
             gemini_models.sort(key=lambda x: ("latest" in x, x), reverse=True)
-            return gemini_models
+            _models_cache[api_key] = (time.monotonic(), gemini_models)
+            return list(gemini_models)
         else:
             return get_default_models()
 
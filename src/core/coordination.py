@@ -1,11 +1,37 @@
 """File coordination and locking mechanism."""
 
-from typing import List, Optional, Set
-from datetime import datetime
-import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+from datetime import datetime, timedelta
 import aiosqlite
 from pydantic import BaseModel
 
+from core.database import (
+    PersistentConnection,
+    from_epoch_us,
+    open_connection,
+    to_epoch_us,
+)
+from core.serialization import dumps, loads
+
+
+_INSERT_FILE_LOCK_SQL = "INSERT INTO file_locks (file_path, agent_id, locked_at, chunk_id) VALUES (?, ?, ?, ?)"
+_DELETE_FILE_LOCKS_SQL = "DELETE FROM file_locks WHERE agent_id = ? AND chunk_id = ?"
+_SELECT_FILE_LOCKS_SQL = "SELECT * FROM file_locks"
+_SELECT_AGENT_FILE_LOCKS_SQL = "SELECT * FROM file_locks WHERE agent_id = ?"
+_INSERT_CHUNK_SQL = "INSERT INTO chunks (chunk_id, description, status, assigned_agent, files, dependencies, pr_number) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_UPDATE_CHUNK_SQL = (
+    "UPDATE chunks SET status = ?, "
+    "assigned_agent = COALESCE(?, assigned_agent), "
+    "pr_number = COALESCE(?, pr_number) "
+    "WHERE chunk_id = ?"
+)
+_SELECT_CHUNK_SQL = "SELECT * FROM chunks WHERE chunk_id = ?"
+_SELECT_CHUNKS_SQL = "SELECT * FROM chunks"
+_SELECT_CHUNKS_BY_STATUS_SQL = "SELECT * FROM chunks WHERE status = ?"
+_COUNT_CHUNKS_BY_STATUS_SQL = "SELECT status, COUNT(*) FROM chunks GROUP BY status"
+_DELETE_EVENTS_BEFORE_SQL = "DELETE FROM events WHERE timestamp < ?"
+
 
 class ChunkStatus:
     PLANNED = "planned"
@@ -31,16 +57,103 @@ class FileLock(BaseModel):
     chunk_id: str
 
 
+def _row_to_chunk(row) -> Chunk:
+    # Rows come from our own schema; skip re-validating them.
+    return Chunk.model_construct(
+        chunk_id=row[0],
+        description=row[1],
+        status=row[2],
+        assigned_agent=row[3],
+        files=loads(row[4]),
+        dependencies=loads(row[5]),
+        pr_number=row[6],
+    )
+
+
+async def _insert_chunk(db: aiosqlite.Connection, chunk: Chunk):
+    await db.execute(
+        _INSERT_CHUNK_SQL,
+        (
+            chunk.chunk_id,
+            chunk.description,
+            chunk.status,
+            chunk.assigned_agent,
+            dumps(chunk.files),
+            dumps(chunk.dependencies),
+            chunk.pr_number,
+        ),
+    )
+
+
+class CoordinationTransaction:
+    """Write operations that share one connection and commit together."""
+
+    def __init__(self, db: aiosqlite.Connection):
+        self._db = db
+
+    async def create_chunk(self, chunk: Chunk):
+        await _insert_chunk(self._db, chunk)
+
+    async def update_chunk_status(
+        self,
+        chunk_id: str,
+        status: str,
+        assigned_agent: Optional[str] = None,
+        pr_number: Optional[int] = None,
+    ):
+        await self._db.execute(
+            _UPDATE_CHUNK_SQL, (status, assigned_agent, pr_number, chunk_id)
+        )
+
+    async def release_file_locks(self, agent_id: str, chunk_id: str):
+        await self._db.execute(_DELETE_FILE_LOCKS_SQL, (agent_id, chunk_id))
+
+
 class CoordinationManager:
     def __init__(self, db_path: str = "coordination.db"):
         self.db_path = db_path
+        self._connection = PersistentConnection(db_path)
+
+    async def close(self):
+        """Close the long-lived database connection, if one is open."""
+        await self._connection.close()
+
+    @asynccontextmanager
+    async def _dedicated_transaction(
+        self, begin: str = "BEGIN"
+    ) -> AsyncIterator[aiosqlite.Connection]:
+        db = await open_connection(self.db_path)
+        try:
+            await db.execute(begin)
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+        finally:
+            await db.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[CoordinationTransaction]:
+        """Group several writes into a single transaction with one commit.
+
+        A dedicated connection is used so statements issued by other callers on
+        the shared connection cannot be folded into (or commit) this transaction.
+        """
+        async with self._dedicated_transaction() as db:
+            yield CoordinationTransaction(db)
 
     async def acquire_file_locks(
         self, agent_id: str, chunk_id: str, file_paths: List[str]
     ) -> bool:
         """Atomically acquire locks for multiple files. Returns True if all locks acquired."""
-        async with aiosqlite.connect(self.db_path) as db:
-            placeholders = ",".join("?" * len(file_paths))
+        placeholders = ",".join("?" * len(file_paths))
+        timestamp = to_epoch_us(datetime.now())
+
+        # BEGIN IMMEDIATE takes the write lock before the check, so no other
+        # agent can insert a lock between the SELECT and the INSERT.
+        async with self._dedicated_transaction("BEGIN IMMEDIATE") as db:
             async with db.execute(
                 f"SELECT file_path FROM file_locks WHERE file_path IN ({placeholders})",
                 file_paths,
@@ -50,64 +163,45 @@ class CoordinationManager:
             if locked_files:
                 return False
 
-            timestamp = datetime.now().isoformat()
-            for file_path in file_paths:
-                await db.execute(
-                    "INSERT INTO file_locks (file_path, agent_id, locked_at, chunk_id) VALUES (?, ?, ?, ?)",
-                    (file_path, agent_id, timestamp, chunk_id),
-                )
+            await db.executemany(
+                _INSERT_FILE_LOCK_SQL,
+                [(file_path, agent_id, timestamp, chunk_id) for file_path in file_paths],
+            )
 
-            await db.commit()
-            return True
+        return True
 
     async def release_file_locks(self, agent_id: str, chunk_id: str):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "DELETE FROM file_locks WHERE agent_id = ? AND chunk_id = ?",
-                (agent_id, chunk_id),
-            )
-            await db.commit()
+        async with self._connection.transaction() as db:
+            await db.execute(_DELETE_FILE_LOCKS_SQL, (agent_id, chunk_id))
 
     async def get_locked_files(self, agent_id: Optional[str] = None) -> List[FileLock]:
-        async with aiosqlite.connect(self.db_path) as db:
-            if agent_id:
-                query = "SELECT * FROM file_locks WHERE agent_id = ?"
-                params = [agent_id]
-            else:
-                query = "SELECT * FROM file_locks"
-                params = []
-
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-
-                locks = []
-                for row in rows:
-                    locks.append(
-                        FileLock(
-                            file_path=row[0],
-                            agent_id=row[1],
-                            locked_at=datetime.fromisoformat(row[2]),
-                            chunk_id=row[3],
-                        )
+        if agent_id:
+            query = _SELECT_AGENT_FILE_LOCKS_SQL
+            params = [agent_id]
+        else:
+            query = _SELECT_FILE_LOCKS_SQL
+            params = []
+
+        db = await self._connection.get()
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+
+            locks = []
+            for row in rows:
+                locks.append(
+                    FileLock.model_construct(
+                        file_path=row[0],
+                        agent_id=row[1],
+                        locked_at=from_epoch_us(row[2]),
+                        chunk_id=row[3],
                     )
+                )
 
-                return locks
+            return locks
 
     async def create_chunk(self, chunk: Chunk):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "INSERT INTO chunks (chunk_id, description, status, assigned_agent, files, dependencies, pr_number) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    chunk.chunk_id,
-                    chunk.description,
-                    chunk.status,
-                    chunk.assigned_agent,
-                    json.dumps(chunk.files),
-                    json.dumps(chunk.dependencies),
-                    chunk.pr_number,
-                ),
-            )
-            await db.commit()
+        async with self._connection.transaction() as db:
+            await _insert_chunk(db, chunk)
 
     async def update_chunk_status(
         self,
@@ -116,96 +210,80 @@ class CoordinationManager:
         assigned_agent: Optional[str] = None,
         pr_number: Optional[int] = None,
     ):
-        async with aiosqlite.connect(self.db_path) as db:
-            updates = ["status = ?"]
-            params = [status]
+        async with self._connection.transaction() as db:
+            await db.execute(
+                _UPDATE_CHUNK_SQL, (status, assigned_agent, pr_number, chunk_id)
+            )
 
-            if assigned_agent is not None:
-                updates.append("assigned_agent = ?")
-                params.append(assigned_agent)
+    async def update_chunk_statuses(self, chunk_ids: List[str], status: str):
+        """Set `status` on several chunks with one executemany and one commit."""
+        if not chunk_ids:
+            return
+        async with self._connection.transaction() as db:
+            await db.executemany(
+                _UPDATE_CHUNK_SQL,
+                [(status, None, None, chunk_id) for chunk_id in chunk_ids],
+            )
 
-            if pr_number is not None:
-                updates.append("pr_number = ?")
-                params.append(pr_number)
+    async def get_chunk(self, chunk_id: str) -> Optional[Chunk]:
+        db = await self._connection.get()
+        async with db.execute(_SELECT_CHUNK_SQL, [chunk_id]) as cursor:
+            row = await cursor.fetchone()
 
-            params.append(chunk_id)
+            if row:
+                return _row_to_chunk(row)
 
-            await db.execute(
-                f"UPDATE chunks SET {', '.join(updates)} WHERE chunk_id = ?", params
-            )
-            await db.commit()
+            return None
 
-    async def get_chunk(self, chunk_id: str) -> Optional[Chunk]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT * FROM chunks WHERE chunk_id = ?", [chunk_id]
-            ) as cursor:
-                row = await cursor.fetchone()
-
-                if row:
-                    return Chunk(
-                        chunk_id=row[0],
-                        description=row[1],
-                        status=row[2],
-                        assigned_agent=row[3],
-                        files=json.loads(row[4]),
-                        dependencies=json.loads(row[5]),
-                        pr_number=row[6],
-                    )
+    async def iter_chunks(self, status: Optional[str] = None) -> AsyncIterator[Chunk]:
+        """Yield chunks one row at a time instead of buffering the whole table."""
+        if status:
+            query = _SELECT_CHUNKS_BY_STATUS_SQL
+            params = [status]
+        else:
+            query = _SELECT_CHUNKS_SQL
+            params = []
 
-                return None
+        db = await self._connection.get()
+        async with db.execute(query, params) as cursor:
+            async for row in cursor:
+                yield _row_to_chunk(row)
 
     async def get_chunks(self, status: Optional[str] = None) -> List[Chunk]:
-        async with aiosqlite.connect(self.db_path) as db:
-            if status:
-                query = "SELECT * FROM chunks WHERE status = ?"
-                params = [status]
-            else:
-                query = "SELECT * FROM chunks"
-                params = []
-
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-
-                chunks = []
-                for row in rows:
-                    chunks.append(
-                        Chunk(
-                            chunk_id=row[0],
-                            description=row[1],
-                            status=row[2],
-                            assigned_agent=row[3],
-                            files=json.loads(row[4]),
-                            dependencies=json.loads(row[5]),
-                            pr_number=row[6],
-                        )
-                    )
+        return [chunk async for chunk in self.iter_chunks(status)]
 
-                return chunks
+    async def get_chunk_status_counts(self) -> Dict[str, int]:
+        """Count chunks per status in SQL rather than loading every chunk."""
+        db = await self._connection.get()
+        async with db.execute(_COUNT_CHUNKS_BY_STATUS_SQL) as cursor:
+            return {status: count async for status, count in cursor}
 
     async def get_next_available_chunks(self) -> List[Chunk]:
-        async with aiosqlite.connect(self.db_path) as db:
+        planned_chunks = await self.get_chunks(ChunkStatus.PLANNED)
+        locked_files = {lock.file_path for lock in await self.get_locked_files()}
 
-            planned_chunks = await self.get_chunks(ChunkStatus.PLANNED)
-            locked_files = {lock.file_path for lock in await self.get_locked_files()}
+        completed_chunks = await self.get_chunks(ChunkStatus.COMPLETE)
+        merged_chunks = await self.get_chunks(ChunkStatus.MERGED)
+        completed_ids = {chunk.chunk_id for chunk in completed_chunks + merged_chunks}
 
-            completed_chunks = await self.get_chunks(ChunkStatus.COMPLETE)
-            merged_chunks = await self.get_chunks(ChunkStatus.MERGED)
-            completed_ids = {
-                chunk.chunk_id for chunk in completed_chunks + merged_chunks
-            }
+        available_chunks = []
+        for chunk in planned_chunks:
+            deps_satisfied = all(
+                dep_id in completed_ids for dep_id in chunk.dependencies
+            )
 
-            available_chunks = []
-            for chunk in planned_chunks:
-                deps_satisfied = all(
-                    dep_id in completed_ids for dep_id in chunk.dependencies
-                )
+            files_available = not any(
+                file_path in locked_files for file_path in chunk.files
+            )
 
-                files_available = not any(
-                    file_path in locked_files for file_path in chunk.files
-                )
+            if deps_satisfied and files_available:
+                available_chunks.append(chunk)
 
-                if deps_satisfied and files_available:
-                    available_chunks.append(chunk)
+        return available_chunks
 
-            return available_chunks
+    async def prune_events(self, keep_days: int) -> int:
+        """Delete events older than keep_days. Returns the number of rows removed."""
+        cutoff = to_epoch_us(datetime.now() - timedelta(days=keep_days))
+        async with self._connection.transaction() as db:
+            cursor = await db.execute(_DELETE_EVENTS_BEFORE_SQL, (cutoff,))
+        return cursor.rowcount
@@ -0,0 +1,234 @@
+"""Shared SQLite connection helpers."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+import aiosqlite
+
+
+# How often a caller re-checks a full pool while waiting for a connection.
+POOL_WAIT_INTERVAL_SECONDS = 0.005
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Encode a datetime as integer microseconds since the Unix epoch."""
+    return round(value.timestamp() * 1_000_000)
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Decode integer epoch microseconds back into a local datetime."""
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros)
+
+
+async def migrate_iso_timestamp_columns(
+    db: aiosqlite.Connection, table: str, columns: Sequence[str], create_sql: str
+):
+    """Rebuild `table` so `columns` store epoch microseconds instead of ISO text.
+
+    `create_sql` must create `table` with the new INTEGER columns. Does nothing
+    when none of the columns is still declared TEXT.
+    """
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        table_columns = await cursor.fetchall()
+
+    column_types = {row[1]: (row[2] or "").upper() for row in table_columns}
+    if not any(column_types.get(column) == "TEXT" for column in columns):
+        return
+
+    names = [row[1] for row in table_columns]
+    indexes = [names.index(column) for column in columns]
+    legacy_table = f"{table}_legacy"
+
+    await db.execute(f"ALTER TABLE {table} RENAME TO {legacy_table}")
+    await db.execute(create_sql)
+
+    async with db.execute(f"SELECT {', '.join(names)} FROM {legacy_table}") as cursor:
+        rows = [list(row) for row in await cursor.fetchall()]
+    for row in rows:
+        for index in indexes:
+            if isinstance(row[index], str):
+                row[index] = to_epoch_us(datetime.fromisoformat(row[index]))
+
+    placeholders = ", ".join("?" * len(names))
+    await db.executemany(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", rows
+    )
+    # Indexes followed the rename and are dropped with the legacy table; callers
+    # create them after migrating.
+    await db.execute(f"DROP TABLE {legacy_table}")
+
+
+def is_memory_database(db_path: str) -> bool:
+    """Whether `db_path` names a private in-memory database rather than a file."""
+    return db_path in ("", ":memory:") or "mode=memory" in db_path
+
+
+async def configure_connection(db: aiosqlite.Connection, db_path: str):
+    """Apply the pragmas shared by every connection to the coordination database.
+
+    WAL lets readers run alongside a writer and commits append to the log
+    instead of rewriting pages; with it, synchronous=NORMAL only syncs at
+    checkpoints. In-memory databases have no journal file and keep their mode.
+    """
+    if not is_memory_database(db_path):
+        await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute("PRAGMA synchronous=NORMAL")
+    await db.execute("PRAGMA busy_timeout=30000")
+    await db.execute("PRAGMA temp_store=MEMORY")
+
+
+async def open_connection(db_path: str) -> aiosqlite.Connection:
+    """Open an aiosqlite connection intended to be reused across many calls.
+
+    The connection's worker thread is marked as a daemon so a connection that
+    is never closed explicitly cannot keep the interpreter alive at exit.
+    """
+    connection = aiosqlite.connect(db_path)
+    connection.daemon = True
+    db = await connection
+    await configure_connection(db, db_path)
+    return db
+
+
+class PersistentConnection:
+    """Lazily opened, long-lived connection to a single database file.
+
+    Reusing one connection keeps sqlite3's per-connection prepared statement
+    cache warm, so constant SQL strings are parsed once rather than per call.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._write_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self) -> aiosqlite.Connection:
+        if self._db is None:
+            db = await open_connection(self.db_path)
+            if self._db is None:
+                self._db = db
+            else:
+                # Another caller opened a connection while we were waiting.
+                await db.close()
+        return self._db
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yield the connection for a write, committing on success.
+
+        Writers are serialized, so each transaction holds only its own
+        statements. On error it is rolled back, so partial writes are not
+        committed later by another caller, and a rollback cannot discard
+        another caller's uncommitted writes.
+        """
+        async with self._get_write_lock():
+            db = await self.get()
+            try:
+                yield db
+            except BaseException:
+                if db.in_transaction:
+                    await db.rollback()
+                raise
+            await db.commit()
+
+    def _get_write_lock(self) -> asyncio.Lock:
+        # An asyncio.Lock binds to one event loop; the desktop app drives the
+        # same objects from several, so the lock is replaced when the loop is.
+        loop = asyncio.get_running_loop()
+        if self._write_lock is None or self._write_lock_loop is not loop:
+            self._write_lock = asyncio.Lock()
+            self._write_lock_loop = loop
+        return self._write_lock
+
+    async def close(self):
+        db, self._db = self._db, None
+        if db is not None:
+            await db.close()
+
+
+class ConnectionPool:
+    """Reusable connections to a single database file for short operations.
+
+    A connection is checked out for the duration of one `async with` block and
+    then kept for the next caller, so calls skip opening the file and applying
+    the pragmas. At most `max_idle` connections are kept between calls.
+
+    Without `max_size`, an extra connection is opened whenever every pooled one
+    is busy. With it, at most `max_size` connections are checked out at once
+    and further callers wait for one to be returned; a pool of one serializes
+    its callers, which suits SQLite's single writer. `query_only` pools refuse
+    writes, so readers cannot take the write lock by mistake.
+
+    No asyncio primitives are involved, so the pool can be shared by the event
+    loops the desktop app runs in its worker threads.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle: int = 4,
+        max_size: Optional[int] = None,
+        query_only: bool = False,
+    ):
+        self.db_path = db_path
+        self.max_idle = max_idle if max_size is None else min(max_idle, max_size)
+        self.max_size = max_size
+        self.query_only = query_only
+        self._idle: List[aiosqlite.Connection] = []
+        self._slots = threading.Semaphore(max_size) if max_size else None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        await self._acquire_slot()
+        try:
+            db = self._idle.pop() if self._idle else await self._open()
+            try:
+                yield db
+            except BaseException:
+                await self._release_after_error(db)
+                raise
+            else:
+                await self._release(db)
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _acquire_slot(self):
+        if self._slots is None:
+            return
+        # Polling keeps the wait usable from any event loop and cancellable
+        # without leaking a slot.
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(POOL_WAIT_INTERVAL_SECONDS)
+
+    async def _open(self) -> aiosqlite.Connection:
+        db = await open_connection(self.db_path)
+        if self.query_only:
+            await db.execute("PRAGMA query_only=1")
+        return db
+
+    async def _release_after_error(self, db: aiosqlite.Connection):
+        # An uncommitted transaction must not leak into the next caller.
+        try:
+            if db.in_transaction:
+                await db.rollback()
+        except Exception:
+            await db.close()
+            return
+        await self._release(db)
+
+    async def _release(self, db: aiosqlite.Connection):
+        if len(self._idle) < self.max_idle:
+            self._idle.append(db)
+        else:
+            await db.close()
+
+    async def close(self):
+        """Close every idle connection. The pool reopens connections on demand."""
+        idle, self._idle = self._idle, []
+        for db in idle:
+            await db.close()
@@ -0,0 +1,20 @@
+"""Event loop selection."""
+
+import asyncio
+import sys
+
+
+def install_uvloop() -> bool:
+    """Make new event loops use uvloop when it is installed.
+
+    Returns True if uvloop's policy was installed. Windows keeps asyncio's
+    default (Proactor) loop, since uvloop does not support it.
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
@@ -1,13 +1,60 @@
 """Event system for agent coordination."""
 
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
-import json
 import asyncio
+import os
+import time
 from pydantic import BaseModel
-import aiosqlite
+from core.database import (
+    PersistentConnection,
+    from_epoch_us,
+    migrate_iso_timestamp_columns,
+    to_epoch_us,
+)
 from core.logger import logger
+from core.serialization import dumps, loads
+
+
+_INSERT_EVENT_SQL = "INSERT INTO events (event_id, event_type, agent_id, data, timestamp) VALUES (?, ?, ?, ?, ?)"
+
+_CREATE_EVENTS_SQL = """
+    CREATE TABLE IF NOT EXISTS events (
+        event_id TEXT PRIMARY KEY,
+        event_type TEXT NOT NULL,
+        agent_id TEXT NOT NULL,
+        data TEXT NOT NULL,
+        timestamp INTEGER NOT NULL
+    )
+"""
+
+_CREATE_FILE_LOCKS_SQL = """
+    CREATE TABLE IF NOT EXISTS file_locks (
+        file_path TEXT PRIMARY KEY,
+        agent_id TEXT NOT NULL,
+        locked_at INTEGER NOT NULL,
+        chunk_id TEXT NOT NULL
+    )
+"""
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _new_event_id() -> str:
+    """Return a 26-character ULID (48-bit millisecond time + 80 random bits).
+
+    ULIDs sort lexicographically in creation order and have a fixed width,
+    which keeps the events primary-key index compact.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(
+        os.urandom(10), "big"
+    )
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD_BASE32[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
 
 
 class EventType(str, Enum):
@@ -41,53 +88,51 @@ class EventBus:
     def __init__(self, db_path: str = "coordination.db"):
         self.db_path = db_path
         self.listeners: Dict[EventType, List[callable]] = {}
+        self._sync_listeners: Dict[EventType, List[callable]] = {}
+        self._async_listeners: Dict[EventType, List[callable]] = {}
+        self._connection = PersistentConnection(db_path)
         self._initialized = False
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self):
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS events (
-                    event_id TEXT PRIMARY KEY,
-                    event_type TEXT NOT NULL,
-                    agent_id TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    timestamp TEXT NOT NULL
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            async with self._connection.transaction() as db:
+                await db.execute(_CREATE_EVENTS_SQL)
+                await db.execute(_CREATE_FILE_LOCKS_SQL)
+
+                # Timestamps used to be stored as ISO strings; convert older databases.
+                await migrate_iso_timestamp_columns(
+                    db, "events", ("timestamp",), _CREATE_EVENTS_SQL
                 )
-            """
-            )
-
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS file_locks (
-                    file_path TEXT PRIMARY KEY,
-                    agent_id TEXT NOT NULL,
-                    locked_at TEXT NOT NULL,
-                    chunk_id TEXT NOT NULL
+                await migrate_iso_timestamp_columns(
+                    db, "file_locks", ("locked_at",), _CREATE_FILE_LOCKS_SQL
                 )
-            """
-            )
-
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS chunks (
-                    chunk_id TEXT PRIMARY KEY,
-                    description TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    assigned_agent TEXT,
-                    files TEXT NOT NULL,
-                    dependencies TEXT NOT NULL,
-                    pr_number INTEGER
+
+                await db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp)"
                 )
-            """
-            )
 
-            await db.commit()
+                await db.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS chunks (
+                        chunk_id TEXT PRIMARY KEY,
+                        description TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        assigned_agent TEXT,
+                        files TEXT NOT NULL,
+                        dependencies TEXT NOT NULL,
+                        pr_number INTEGER
+                    )
+                    """
+                )
 
-        self._initialized = True
+            self._initialized = True
 
     async def publish(
         self, event_type: EventType, agent_id: str, data: Dict[str, Any]
@@ -102,7 +147,7 @@ class EventBus:
             logger.debug("EventBus initialization completed")
 
         logger.debug("Creating event object...")
-        event_id = f"{agent_id}_{event_type}_{datetime.now().isoformat()}"
+        event_id = _new_event_id()
         event = Event(
             event_id=event_id,
             event_type=event_type,
@@ -114,18 +159,17 @@ class EventBus:
 
         logger.debug("About to insert event into database...")
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection.transaction() as db:
                 await db.execute(
-                    "INSERT INTO events (event_id, event_type, agent_id, data, timestamp) VALUES (?, ?, ?, ?, ?)",
+                    _INSERT_EVENT_SQL,
                     (
                         event.event_id,
-                        event.event_type,
+                        event.event_type.value,
                         event.agent_id,
-                        json.dumps(event.data),
-                        event.timestamp.isoformat(),
+                        dumps(event.data),
+                        to_epoch_us(event.timestamp),
                     ),
                 )
-                await db.commit()
             logger.debug("Event inserted into database successfully")
         except Exception as e:
             logger.debug(f"Error inserting event into database: {e}")
@@ -135,32 +179,63 @@ class EventBus:
         if event_type in self.listeners:
             listener_count = len(self.listeners[event_type])
             logger.debug(f"Found {listener_count} listeners, notifying them...")
-            for i, listener in enumerate(self.listeners[event_type]):
+            for i, listener in enumerate(self._sync_listeners.get(event_type, ())):
                 try:
-                    logger.debug(f"Calling listener {i+1}/{listener_count}")
-                    if asyncio.iscoroutinefunction(listener):
-                        await listener(event)
-                    else:
-                        listener(event)
-                    logger.debug(
-                        f"Listener {i+1}/{listener_count} completed successfully"
-                    )
+                    listener(event)
                 except Exception as e:
-                    logger.debug(f"Error in event listener {i+1}: {e}")
+                    logger.debug(f"Error in sync event listener {i+1}: {e}")
+
+            async_listeners = self._async_listeners.get(event_type, ())
+            if async_listeners:
+                results = await asyncio.gather(
+                    *(listener(event) for listener in async_listeners),
+                    return_exceptions=True,
+                )
+                for i, result in enumerate(results):
+                    if isinstance(result, BaseException):
+                        logger.debug(f"Error in async event listener {i+1}: {result}")
+            logger.debug(f"All {listener_count} listeners notified")
         else:
             logger.debug(f"No listeners found for event type: {event_type}")
 
         logger.debug(f"EventBus.publish completing, returning event_id: {event_id}")
         return event_id
 
+    async def close(self):
+        """Close the long-lived database connection, if one is open."""
+        await self._connection.close()
+
     def subscribe(self, event_type: EventType, callback: callable):
+        event_type = EventType(event_type)
         if event_type not in self.listeners:
             self.listeners[event_type] = []
         self.listeners[event_type].append(callback)
 
-    async def get_events(
+        if asyncio.iscoroutinefunction(callback):
+            self._async_listeners.setdefault(event_type, []).append(callback)
+        else:
+            self._sync_listeners.setdefault(event_type, []).append(callback)
+
+    def unsubscribe_all(self, owner: Any):
+        """Remove every listener that is a bound method of `owner`."""
+        for registry in (self.listeners, self._sync_listeners, self._async_listeners):
+            for event_type, callbacks in list(registry.items()):
+                # Rebuild rather than mutate, so an in-flight publish keeps
+                # iterating the list it started with.
+                remaining = [
+                    callback
+                    for callback in callbacks
+                    if getattr(callback, "__self__", None) is not owner
+                ]
+                if remaining:
+                    registry[event_type] = remaining
+                else:
+                    del registry[event_type]
+
+    async def iter_events(
         self, event_type: Optional[EventType] = None, agent_id: Optional[str] = None
-    ) -> List[Event]:
+    ) -> AsyncIterator[Event]:
+        """Yield events newest first, one row at a time."""
         if not self._initialized:
             await self.initialize()
 
@@ -170,7 +245,7 @@ class EventBus:
 
         if event_type:
             conditions.append("event_type = ?")
-            params.append(event_type)
+            params.append(EventType(event_type).value)
 
         if agent_id:
             conditions.append("agent_id = ?")
@@ -181,20 +256,19 @@ class EventBus:
 
         query += " ORDER BY timestamp DESC"
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-
-                events = []
-                for row in rows:
-                    events.append(
-                        Event(
-                            event_id=row[0],
-                            event_type=EventType(row[1]),
-                            agent_id=row[2],
-                            data=json.loads(row[3]),
-                            timestamp=datetime.fromisoformat(row[4]),
-                        )
-                    )
+        db = await self._connection.get()
+        async with db.execute(query, params) as cursor:
+            async for row in cursor:
+                # Rows come from our own schema; skip re-validating them.
+                yield Event.model_construct(
+                    event_id=row[0],
+                    event_type=EventType._value2member_map_[row[1]],
+                    agent_id=row[2],
+                    data=loads(row[3]),
+                    timestamp=from_epoch_us(row[4]),
+                )
 
-                return events
+    async def get_events(
+        self, event_type: Optional[EventType] = None, agent_id: Optional[str] = None
+    ) -> List[Event]:
+        return [event async for event in self.iter_events(event_type, agent_id)]
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 import sys
@@ -34,11 +35,14 @@ class StableStreamHandler(logging.StreamHandler):
                 pass
 
 
+@functools.lru_cache(maxsize=1)
 def setup_logger(output_stream=None, log_level_override=None):
     """
     Configures and returns a logger instance.
     The log level is determined by the DEBUG environment variable or override.
     The stream for the handler is determined by output_stream or defaults to sys.stderr.
+    Repeated calls with the same arguments return the cached instance without
+    rebuilding the stream wrapper or handlers.
     """
     if log_level_override is not None:
         log_level = log_level_override
@@ -100,12 +104,6 @@ def setup_logger(output_stream=None, log_level_override=None):
     ch.setFormatter(formatter)
     logger_instance.addHandler(ch)
 
-    diag_stream = (
-        sys.stderr
-        if sys.stderr and not getattr(sys.stderr, "closed", False)
-        else open(os.devnull, "w")
-    )
-
     return logger_instance
 
 
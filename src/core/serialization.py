@@ -0,0 +1,27 @@
+"""Compact JSON helpers for values stored in SQLite columns."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to compact JSON text (no insignificant whitespace)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            # orjson rejects a few inputs the stdlib accepts (e.g. int dict keys).
+            pass
+    return json.dumps(value, separators=(",", ":"))
+
+
+def loads(data) -> Any:
+    """Deserialize JSON stored as TEXT or BLOB."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,10 +1,26 @@
 """File system browser for repository selection and exploration."""
 
+import ctypes
+import errno
+import gzip
+import hashlib
+import json
 import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import AbstractSet, Callable, Iterator, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 
+try:
+    import git
+except ImportError:
+    git = None
+
 
 class FileNode(BaseModel):
     name: str
@@ -29,16 +45,330 @@ class RepositoryInfo(BaseModel):
     languages: Dict[str, int] = {}
 
 
+REPO_INFO_CACHE_SIZE = 256
+# File extensions that count as source code when validating a repository.
+SOURCE_EXTENSIONS = frozenset(
+    {
+        ".py",
+        ".js",
+        ".ts",
+        ".jsx",
+        ".tsx",
+        ".java",
+        ".cpp",
+        ".c",
+        ".cs",
+        ".go",
+        ".rs",
+        ".rb",
+        ".php",
+        ".swift",
+        ".kt",
+        ".scala",
+    }
+)
+
+GIT_REPO_CACHE_SIZE = 32
+REPO_INFO_CACHE_DIR = Path.home() / ".cache" / "automaton" / "repo_info"
+# The cache key only sees the root directory, so changes further down go
+# unnoticed; scans older than this are redone and their snapshots deleted.
+REPO_INFO_MAX_AGE_SECONDS = 300
+
+# Directory names that are never descended into when scanning a repository.
+SKIP_DIRS = frozenset(
+    {
+        "__pycache__",
+        "node_modules",
+        ".git",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".venv",
+        "venv",
+        ".env",
+    }
+)
+
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_BASIC_STATS = 0x7FF
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_int64),
+        ("tv_nsec", ctypes.c_uint32),
+        ("_reserved", ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("_spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp),
+        ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp),
+        ("stx_mtime", _StatxTimestamp),
+        ("stx_rdev_major", ctypes.c_uint32),
+        ("stx_rdev_minor", ctypes.c_uint32),
+        ("stx_dev_major", ctypes.c_uint32),
+        ("stx_dev_minor", ctypes.c_uint32),
+        ("_spare2", ctypes.c_uint64 * 14),
+    ]
+
+
+_statx = None
+if sys.platform.startswith("linux"):
+    try:
+        _statx = ctypes.CDLL(None, use_errno=True).statx
+        _statx.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_int,
+            ctypes.c_uint,
+            ctypes.POINTER(_Statx),
+        ]
+        _statx.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _statx = None
+
+
+def _fast_stat(path: str) -> os.stat_result:
+    """stat a path, letting network filesystems answer from their cache.
+
+    Symlinks are followed, matching DirEntry.stat(), so cached-stat mode only
+    changes how fresh the result is. On Linux this calls statx with
+    AT_STATX_DONT_SYNC, so NFS and similar filesystems skip revalidating
+    attributes with the server; the result may be slightly stale. Elsewhere it
+    is a plain stat.
+    """
+    if _statx is None:
+        return os.stat(path)
+
+    buf = _Statx()
+    if _statx(
+        _AT_FDCWD,
+        os.fsencode(path),
+        _AT_STATX_DONT_SYNC,
+        _STATX_BASIC_STATS,
+        ctypes.byref(buf),
+    ):
+        err = ctypes.get_errno()
+        if err == errno.ENOSYS:
+            return os.stat(path)
+        raise OSError(err, os.strerror(err), path)
+
+    def ns(ts: _StatxTimestamp) -> int:
+        return ts.tv_sec * 1_000_000_000 + ts.tv_nsec
+
+    atime_ns = ns(buf.stx_atime)
+    mtime_ns = ns(buf.stx_mtime)
+    ctime_ns = ns(buf.stx_ctime)
+    return os.stat_result(
+        (
+            buf.stx_mode,
+            buf.stx_ino,
+            os.makedev(buf.stx_dev_major, buf.stx_dev_minor),
+            buf.stx_nlink,
+            buf.stx_uid,
+            buf.stx_gid,
+            buf.stx_size,
+            buf.stx_atime.tv_sec,
+            buf.stx_mtime.tv_sec,
+            buf.stx_ctime.tv_sec,
+        ),
+        {
+            "st_atime": atime_ns / 1e9,
+            "st_mtime": mtime_ns / 1e9,
+            "st_ctime": ctime_ns / 1e9,
+            "st_atime_ns": atime_ns,
+            "st_mtime_ns": mtime_ns,
+            "st_ctime_ns": ctime_ns,
+            "st_blksize": buf.stx_blksize,
+            "st_blocks": buf.stx_blocks,
+            "st_rdev": os.makedev(buf.stx_rdev_major, buf.stx_rdev_minor),
+        },
+    )
+
+
+@dataclass(slots=True)
+class WalkTotals:
+    """Mutable accumulator for a tree walk; internal, so not a pydantic model."""
+
+    file_count: int = 0
+    directory_count: int = 0
+    total_size: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+
+
+def _scan_directory(
+    path: str, skip_dirs: AbstractSet[str], cached_stat: bool = False
+) -> Tuple[int, int, int, Counter, List[str]]:
+    """Scan a single directory, returning its totals and subdirectories to visit."""
+    file_count = 0
+    directory_count = 0
+    total_size = 0
+    languages = Counter()
+    subdirs = []
+
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return file_count, directory_count, total_size, languages, subdirs
+
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+
+        try:
+            if entry.is_dir():
+                if entry.name in skip_dirs:
+                    continue
+                directory_count += 1
+                # A symlinked directory counts as a directory but is not
+                # descended, so the walk stays inside the tree and cannot loop.
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+
+            elif entry.is_file():
+                file_count += 1
+                stat = _fast_stat(entry.path) if cached_stat else entry.stat()
+                total_size += stat.st_size
+
+                extension = os.path.splitext(entry.name)[1].lower()
+                if extension:
+                    languages[extension] += 1
+
+        except OSError:
+            continue
+
+    return file_count, directory_count, total_size, languages, subdirs
+
+
+def _iter_files(root: str, skip_dirs: AbstractSet[str]) -> Iterator[str]:
+    """Lazily yield file names under root, depth first, pruning skipped dirs."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if (
+                                not entry.name.startswith(".")
+                                and entry.name not in skip_dirs
+                            ):
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.name
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+_scan_executor: Optional[ThreadPoolExecutor] = None
+_scan_executor_lock = threading.Lock()
+
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every FileBrowser; its threads start on demand.
+
+    The desktop app creates a FileBrowser per validation, so a pool per
+    instance would leave idle worker threads behind each time.
+    """
+    global _scan_executor
+    with _scan_executor_lock:
+        if _scan_executor is None:
+            _scan_executor = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 1) * 4),
+                thread_name_prefix="file-scan",
+            )
+        return _scan_executor
+
+
+class _ParallelScanner:
+    """Directory scans on the shared scan thread pool.
+
+    scandir and stat release the GIL, so scans submitted here overlap. Work is
+    accumulated per task and merged on the calling thread, so no locking is
+    needed.
+    """
+
+    def __init__(self):
+        self._executor = _get_scan_executor()
+
+    def walk(
+        self, root: str, skip_dirs: AbstractSet[str], cached_stat: bool = False
+    ) -> WalkTotals:
+        """Walk a tree, pruning hidden and `skip_dirs` directories.
+
+        Each directory is scanned as its own task and its subdirectories are
+        submitted as soon as it completes.
+        """
+        totals = WalkTotals()
+        languages = Counter()
+
+        submit = self._executor.submit
+        pending = {submit(_scan_directory, root, skip_dirs, cached_stat)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, dirs, size, dir_languages, subdirs = future.result()
+                totals.file_count += files
+                totals.directory_count += dirs
+                totals.total_size += size
+                languages.update(dir_languages)
+                pending.update(
+                    submit(_scan_directory, subdir, skip_dirs, cached_stat)
+                    for subdir in subdirs
+                )
+
+        totals.languages = dict(languages)
+        return totals
+
+    def map(self, fn: Callable, items: List) -> List:
+        return list(self._executor.map(fn, items))
+
+
 class FileBrowser:
     """Safe file system browser for repository selection and exploration."""
 
-    def __init__(self, root_path: Optional[str] = None):
+    def __init__(self, root_path: Optional[str] = None, use_cached_stat: bool = False):
+        # use_cached_stat trades exactness for speed on network filesystems;
+        # see _fast_stat.
+        self.use_cached_stat = use_cached_stat
         self.root_path = Path(root_path) if root_path else Path.cwd()
         self.allowed_roots = [
             self.root_path,
             Path.home(),
             Path("/tmp") if os.name != "nt" else Path("C:/temp"),
         ]
+        self._resolved_allowed_roots = tuple(
+            root.resolve() for root in self.allowed_roots
+        )
+        # LRU caches keyed on (path, mtime_ns, inode) of the scanned root, so an
+        # entry is reused until the root directory itself changes. Repository
+        # info holds (scanned_at, info) and also expires after
+        # REPO_INFO_MAX_AGE_SECONDS, since nested changes leave the key alone.
+        self._repo_info_cache: "OrderedDict[tuple, Tuple[float, RepositoryInfo]]" = (
+            OrderedDict()
+        )
+        self._has_source_cache: "OrderedDict[tuple, bool]" = OrderedDict()
+        self._scanner = _ParallelScanner()
+        # Open git.Repo handles by path, so .git/config is parsed once per repo.
+        self._git_repos: "OrderedDict[tuple, Any]" = OrderedDict()
 
     def get_directory_listing(
         self, path: str, include_hidden: bool = False, max_depth: int = 1
@@ -52,65 +382,99 @@ class FileBrowser:
         if not path_obj.exists() or not path_obj.is_dir():
             raise ValueError(f"Path is not a valid directory: {path}")
 
-        nodes = []
-
         try:
-            for item in sorted(path_obj.iterdir()):
-                if not include_hidden and item.name.startswith("."):
-                    continue
+            nodes = self._list_directory(str(path_obj), include_hidden)
+        except PermissionError:
+            raise ValueError(f"Permission denied accessing directory: {path}")
 
-                if item.name in [
-                    "__pycache__",
-                    "node_modules",
-                    ".git",
-                    ".pytest_cache",
-                    ".mypy_cache",
-                    ".venv",
-                    "venv",
-                    ".env",
-                ]:
-                    if item.name != ".git" or not include_hidden:
-                        continue
+        # Expand one level at a time, listing all directories of a level in
+        # parallel. Symlinked directories are listed but never descended, so
+        # children cannot leave the checked root and the allow-list is
+        # evaluated once.
+        def list_children(node: FileNode) -> List[FileNode]:
+            try:
+                return self._list_directory(node.path, include_hidden)
+            except OSError:
+                return []
+
+        level = nodes
+        for _ in range(max_depth - 1):
+            expandable = [
+                node
+                for node in level
+                if node.is_directory
+                and node.is_expandable
+                and not os.path.islink(node.path)
+            ]
+            if not expandable:
+                break
 
-                try:
-                    stat = item.stat()
-                    is_git_repo = False
-                    is_expandable = False
+            level = []
+            for node, children in zip(
+                expandable, self._scanner.map(list_children, expandable)
+            ):
+                node.children = children
+                level.extend(children)
 
-                    if item.is_dir():
-                        if (item / ".git").exists():
-                            is_git_repo = True
+        return nodes
 
-                        try:
-                            is_expandable = any(item.iterdir())
-                        except PermissionError:
-                            is_expandable = False
-
-                    node = FileNode(
-                        name=item.name,
-                        path=str(item),
-                        is_directory=item.is_dir(),
-                        size=stat.st_size if item.is_file() else None,
-                        modified=str(stat.st_mtime),
-                        is_git_repo=is_git_repo,
-                        is_expandable=is_expandable,
-                    )
+    def _list_directory(self, path: str, include_hidden: bool) -> List[FileNode]:
+        """List a single directory level as FileNodes, sorted by name."""
+        nodes = []
 
-                    if max_depth > 1 and item.is_dir() and is_expandable:
-                        try:
-                            node.children = self.get_directory_listing(
-                                str(item), include_hidden, max_depth - 1
-                            )
-                        except (PermissionError, ValueError):
-                            node.children = []
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
 
-                    nodes.append(node)
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
 
-                except (PermissionError, OSError):
+            if entry.name in SKIP_DIRS:
+                if entry.name != ".git" or not include_hidden:
                     continue
 
-        except PermissionError:
-            raise ValueError(f"Permission denied accessing directory: {path}")
+            try:
+                # One stat per entry: DirEntry caches it and takes the file type
+                # from readdir, and the .git probe only runs for directories.
+                # Symlinks are followed, so a linked directory is listed (and
+                # sized) as the directory it points to.
+                if self.use_cached_stat:
+                    stat = _fast_stat(entry.path)
+                else:
+                    stat = entry.stat()
+                is_dir = entry.is_dir()
+                is_git_repo = False
+                is_expandable = False
+
+                if is_dir:
+                    try:
+                        os.stat(
+                            os.path.join(entry.path, ".git"), follow_symlinks=False
+                        )
+                        is_git_repo = True
+                    except OSError:
+                        pass
+
+                    try:
+                        with os.scandir(entry.path) as children:
+                            is_expandable = next(children, None) is not None
+                    except OSError:
+                        is_expandable = False
+
+                nodes.append(
+                    FileNode(
+                        name=entry.name,
+                        path=entry.path,
+                        is_directory=is_dir,
+                        size=None if is_dir else stat.st_size,
+                        modified=str(stat.st_mtime),
+                        is_git_repo=is_git_repo,
+                        is_expandable=is_expandable,
+                    )
+                )
+
+            except OSError:
+                continue
 
         return nodes
 
@@ -124,77 +488,49 @@ class FileBrowser:
         if not path_obj.exists() or not path_obj.is_dir():
             raise ValueError(f"Path is not a valid directory: {path}")
 
+        cache_key = self._cache_key(path_obj)
+        cached = self._cache_get(self._repo_info_cache, cache_key)
+        if cached is None:
+            cached = self._load_repo_cache(cache_key)
+            if cached is not None:
+                self._cache_put(self._repo_info_cache, cache_key, cached)
+        if cached is not None and time.time() - cached[0] < REPO_INFO_MAX_AGE_SECONDS:
+            return cached[1]
+
         is_git_repo = (path_obj / ".git").exists()
         has_remote = False
 
         if is_git_repo:
             try:
-                import git
-
-                repo = git.Repo(path_obj)
+                repo = self._get_git_repo(path_obj)
                 has_remote = len(list(repo.remotes)) > 0
             except Exception:
                 has_remote = False
 
-        file_count = 0
-        directory_count = 0
-        total_size = 0
-        languages = {}
-
-        try:
-            for item in path_obj.rglob("*"):
-                if any(
-                    part.startswith(".") for part in item.parts[len(path_obj.parts) :]
-                ):
-                    continue
-
-                if any(
-                    skip in str(item)
-                    for skip in [
-                        "__pycache__",
-                        "node_modules",
-                        ".pytest_cache",
-                        ".mypy_cache",
-                        ".venv",
-                        "venv",
-                    ]
-                ):
-                    continue
-
-                try:
-                    if item.is_file():
-                        file_count += 1
-                        stat = item.stat()
-                        total_size += stat.st_size
-
-                        extension = item.suffix.lower()
-                        if extension:
-                            languages[extension] = languages.get(extension, 0) + 1
-
-                    elif item.is_dir():
-                        directory_count += 1
-
-                except (PermissionError, OSError):
-                    continue
-
-        except Exception as e:
-            pass
+        totals = self._scanner.walk(
+            str(path_obj), SKIP_DIRS, cached_stat=self.use_cached_stat
+        )
+        languages = totals.languages
 
         main_language = None
         if languages:
             main_language = max(languages.items(), key=lambda x: x[1])[0]
 
-        return RepositoryInfo(
+        repo_info = RepositoryInfo(
             path=str(path_obj),
             name=path_obj.name,
             is_git_repo=is_git_repo,
             has_remote=has_remote,
-            file_count=file_count,
-            directory_count=directory_count,
-            total_size=total_size,
+            file_count=totals.file_count,
+            directory_count=totals.directory_count,
+            total_size=totals.total_size,
             main_language=main_language,
             languages=languages,
         )
+        scanned_at = time.time()
+        self._cache_put(self._repo_info_cache, cache_key, (scanned_at, repo_info))
+        self._store_repo_cache(cache_key, scanned_at, repo_info)
+        return repo_info
 
     def validate_repository_path(self, path: str) -> Dict[str, Any]:
         """Validate if a path is suitable for use as a target repository."""
@@ -229,6 +565,11 @@ class FileBrowser:
 
         validation_result["is_directory"] = True
 
+        # The write probe below bumps the directory mtime, so look the cached
+        # has_source flag up with the key from before it and store it under the
+        # key from after it.
+        source_cache_key = self._cache_key(path_obj)
+
         try:
             test_file = path_obj / ".temp_write_test"
             test_file.touch()
@@ -240,9 +581,7 @@ class FileBrowser:
         if (path_obj / ".git").exists():
             validation_result["is_git_repo"] = True
             try:
-                import git
-
-                repo = git.Repo(path_obj)
+                repo = self._get_git_repo(path_obj)
                 if repo.heads:
                     latest_commit = repo.head.commit
                     validation_result["latest_commit"] = {
@@ -266,33 +605,16 @@ class FileBrowser:
                 "Not a git repository - will be initialized automatically"
             )
 
-        source_extensions = {
-            ".py",
-            ".js",
-            ".ts",
-            ".jsx",
-            ".tsx",
-            ".java",
-            ".cpp",
-            ".c",
-            ".cs",
-            ".go",
-            ".rs",
-            ".rb",
-            ".php",
-            ".swift",
-            ".kt",
-            ".scala",
-        }
-
-        has_source = False
-        try:
-            for item in path_obj.rglob("*"):
-                if item.is_file() and item.suffix.lower() in source_extensions:
+        has_source = self._cache_get(self._has_source_cache, source_cache_key)
+        if has_source is None:
+            has_source = False
+            for name in _iter_files(str(path_obj), SKIP_DIRS):
+                if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS:
                     has_source = True
                     break
-        except Exception:
-            pass
+        self._cache_put(
+            self._has_source_cache, self._cache_key(path_obj), has_source
+        )
 
         validation_result["has_source_files"] = has_source
         if not has_source:
@@ -355,13 +677,115 @@ class FileBrowser:
 
         return recent_repos[:limit]
 
+    def _get_git_repo(self, path: Path):
+        if git is None:
+            raise ImportError("GitPython is not installed")
+
+        key = (str(path),)
+        repo = self._cache_get(self._git_repos, key)
+        if repo is None:
+            repo = git.Repo(path)
+            self._cache_put(self._git_repos, key, repo, GIT_REPO_CACHE_SIZE)
+        return repo
+
+    @staticmethod
+    def _cache_key(path: Path) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (str(path), stat.st_mtime_ns, stat.st_ino)
+
+    @staticmethod
+    def _repo_cache_file(cache_key: tuple) -> Path:
+        digest = hashlib.blake2b(cache_key[0].encode(), digest_size=16).hexdigest()
+        return REPO_INFO_CACHE_DIR / f"{digest}.json.gz"
+
+    def _load_repo_cache(
+        self, cache_key: Optional[tuple]
+    ) -> Optional[Tuple[float, RepositoryInfo]]:
+        """Read a (scanned_at, info) snapshot if the root is unchanged since."""
+        if cache_key is None:
+            return None
+        try:
+            with gzip.open(self._repo_cache_file(cache_key), "rt") as f:
+                snapshot = json.load(f)
+            if (
+                snapshot["path"] != cache_key[0]
+                or snapshot["root_mtime_ns"] != cache_key[1]
+                or snapshot["root_ino"] != cache_key[2]
+            ):
+                return None
+            return snapshot["scanned_at"], RepositoryInfo(**snapshot["repo_info"])
+        except Exception:
+            return None
+
+    def _store_repo_cache(
+        self, cache_key: Optional[tuple], scanned_at: float, repo_info: RepositoryInfo
+    ):
+        """Persist a repository snapshot; failures only cost a future rescan."""
+        if cache_key is None:
+            return
+        snapshot = {
+            "path": cache_key[0],
+            "root_mtime_ns": cache_key[1],
+            "root_ino": cache_key[2],
+            "scanned_at": scanned_at,
+            "repo_info": repo_info.model_dump(),
+        }
+        cache_file = self._repo_cache_file(cache_key)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp_file, "wt") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+        self._prune_repo_cache(scanned_at - REPO_INFO_MAX_AGE_SECONDS)
+
+    @staticmethod
+    def _prune_repo_cache(cutoff: float):
+        """Delete snapshots (and abandoned temp files) last written before cutoff."""
+        try:
+            with os.scandir(REPO_INFO_CACHE_DIR) as it:
+                for entry in it:
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+    @staticmethod
+    def _cache_get(cache: OrderedDict, key: Optional[tuple]) -> Any:
+        if key is None or key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+
+    @staticmethod
+    def _cache_put(
+        cache: OrderedDict,
+        key: Optional[tuple],
+        value: Any,
+        max_size: int = REPO_INFO_CACHE_SIZE,
+    ):
+        if key is None:
+            return
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
     def _is_path_allowed(self, path: Path) -> bool:
         """Check if a path is within allowed roots for security."""
         try:
             path = path.resolve()
-            for allowed_root in self.allowed_roots:
+            for allowed_root in self._resolved_allowed_roots:
                 try:
-                    path.relative_to(allowed_root.resolve())
+                    path.relative_to(allowed_root)
                     return True
                 except ValueError:
                     continue
@@ -100,19 +100,19 @@ class NativeFileBrowser:
 
         if info["exists"] and info["is_directory"]:
 
-            git_dir = path_obj / ".git"
-            info["is_git_repo"] = git_dir.exists()
+            info["is_git_repo"] = os.path.exists(os.path.join(path, ".git"))
 
             try:
-                for item in path_obj.iterdir():
-                    if item.is_file():
-                        info["file_count"] += 1
-                        try:
-                            info["total_size"] += item.stat().st_size
-                        except (OSError, FileNotFoundError):
-                            pass
-                    elif item.is_dir():
-                        info["folder_count"] += 1
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            info["file_count"] += 1
+                            try:
+                                info["total_size"] += entry.stat().st_size
+                            except OSError:
+                                pass
+                        elif entry.is_dir():
+                            info["folder_count"] += 1
             except (PermissionError, OSError):
                 info["file_count"] = -1
                 info["folder_count"] = -1
@@ -128,13 +128,17 @@ class NativeFileBrowser:
             pass
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == -1:
         return "Unknown"
 
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} PB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+
+    # Each unit is a factor of 2**10, so the bit length picks it directly.
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
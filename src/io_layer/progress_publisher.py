@@ -1,13 +1,32 @@
 """Progress publishing and real-time event streaming."""
 
 import asyncio
-import json
+import itertools
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, AsyncIterator, Any
+from typing import Dict, List, Optional, AsyncIterator, Any, Set, Tuple
+from uuid import uuid4
 from pydantic import BaseModel
 import aiosqlite
 
+from src.core.logger import logger
+from core.database import PersistentConnection, from_epoch_us
+from core.serialization import dumps, loads
+
+
+_INSERT_PROGRESS_EVENT_SQL = """
+    INSERT INTO progress_events (event_id, task_id, event_type, timestamp, data, message)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# How long the background writer waits for more events to arrive before
+# writing everything buffered so far in a single commit.
+PROGRESS_FLUSH_INTERVAL_SECONDS = 0.005
+
+# Each subscriber buffers at most this many events. When a slow consumer falls
+# behind, its oldest undelivered event is dropped to make room for the newest.
+SUBSCRIBER_QUEUE_SIZE = 1024
+
 
 class ProgressEventType(str, Enum):
     TASK_STARTED = "task_started"
@@ -76,36 +95,70 @@ class ProgressPublisher:
 
     def __init__(self, db_path: str = "coordination.db"):
         self.db_path = db_path
-        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._connection = PersistentConnection(db_path)
+        self._pending: List[tuple] = []
+        self._writer: Optional[asyncio.Task] = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self):
-        """Initialize the progress tracking database tables."""
+        """Initialize the progress tracking database tables.
+
+        Runs the DDL once per instance; later calls return immediately.
+        """
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS progress_events (
-                    event_id TEXT PRIMARY KEY,
-                    task_id TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    message TEXT
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            async with self._connection.transaction() as db:
+                await db.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS progress_events (
+                        event_id TEXT PRIMARY KEY,
+                        task_id TEXT NOT NULL,
+                        event_type TEXT NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        data TEXT NOT NULL,
+                        message TEXT
+                    )
+                    """
+                )
+                # (task_id, timestamp) serves the per-task newest-first query
+                # without a separate sort step; it supersedes the old
+                # single-column indexes.
+                await db.execute("DROP INDEX IF EXISTS idx_progress_task_id")
+                await db.execute("DROP INDEX IF EXISTS idx_progress_timestamp")
+                await db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_progress_task_ts ON progress_events(task_id, timestamp DESC)"
+                )
+                await db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_progress_ts ON progress_events(timestamp DESC)"
                 )
-            """
-            )
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_progress_task_id ON progress_events(task_id)"
-            )
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_progress_timestamp ON progress_events(timestamp)"
-            )
-            await db.commit()
 
-        self._initialized = True
+            self._initialized = True
+
+    async def flush(self):
+        """Wait until every published event has been written to the database."""
+        writer = self._writer
+        if (
+            writer is not None
+            and not writer.done()
+            and writer.get_loop() is asyncio.get_running_loop()
+        ):
+            await writer
+        await self._write_pending()
+
+    async def close(self):
+        """Flush pending events, stop the writer and close the connection."""
+        await self.flush()
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+        self._writer = None
+        await self._connection.close()
 
     async def publish_progress(
         self,
@@ -115,50 +168,104 @@ class ProgressPublisher:
         message: Optional[str] = None,
     ) -> str:
         """Publish a progress event."""
+        event_ids = await self.publish_progress_batch(
+            [(task_id, event_type, data, message)]
+        )
+        return event_ids[0]
+
+    async def publish_progress_batch(
+        self,
+        events: List[Tuple[str, ProgressEventType, Dict[str, Any], Optional[str]]],
+    ) -> List[str]:
+        """Publish (task_id, event_type, data, message) events in a single write."""
         await self.initialize()
 
-        import uuid
+        event_ids, rows, notify = self._prepare_events(events)
+        self._pending.extend(rows)
+        self._ensure_writer()
 
-        event_id = str(uuid.uuid4())
-        timestamp = datetime.now()
+        for event in notify:
+            await self._notify_subscribers(event.task_id, event)
 
-        event = ProgressEvent(
-            event_id=event_id,
-            task_id=task_id,
-            event_type=event_type,
-            timestamp=timestamp,
-            data=data,
-            message=message,
-        )
+        return event_ids
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO progress_events (event_id, task_id, event_type, timestamp, data, message)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
+    async def stage_progress_batch(
+        self,
+        db: aiosqlite.Connection,
+        events: List[Tuple[str, ProgressEventType, Dict[str, Any], Optional[str]]],
+    ) -> Tuple[List[str], List[ProgressEvent]]:
+        """Write events on `db` as part of the caller's open transaction.
+
+        Lets another component commit its own changes together with the
+        progress events that describe them; the caller commits. Call
+        initialize() and flush() before starting the transaction: the table
+        DDL and buffered events are written on the publisher's own connection,
+        which cannot commit while the caller holds the database write lock,
+        and buffered events must be written first to keep their order.
+
+        Returns the event ids and the events for subscribers. Subscribers are
+        not notified here; pass the events to notify_staged() once the commit
+        has succeeded, so nobody hears of a change that was rolled back.
+        """
+        event_ids, rows, notify = self._prepare_events(events)
+        await db.executemany(_INSERT_PROGRESS_EVENT_SQL, rows)
+
+        return event_ids, notify
+
+    async def notify_staged(self, events: List[ProgressEvent]):
+        """Deliver events returned by stage_progress_batch after their commit."""
+        for event in events:
+            await self._notify_subscribers(event.task_id, event)
+
+    def _prepare_events(
+        self,
+        events: List[Tuple[str, ProgressEventType, Dict[str, Any], Optional[str]]],
+    ) -> Tuple[List[str], List[tuple], List[ProgressEvent]]:
+        """Build the ids, database rows and subscriber notifications for events."""
+        event_ids = []
+        rows = []
+        notify = []
+        has_global_subscribers = "__ALL__" in self.subscribers
+
+        for task_id, event_type, data, message in events:
+            event_id = uuid4().hex
+            timestamp = datetime.now()
+            event_ids.append(event_id)
+
+            # Fields are already typed by the caller, so the row is written
+            # without building a model; one is only built if someone listens.
+            rows.append(
                 (
-                    event.event_id,
-                    event.task_id,
-                    event.event_type,
-                    event.timestamp.isoformat(),
-                    json.dumps(event.data),
-                    event.message,
-                ),
+                    event_id,
+                    task_id,
+                    event_type,
+                    timestamp.isoformat(),
+                    dumps(data),
+                    message,
+                )
             )
-            await db.commit()
 
-        await self._notify_subscribers(task_id, event)
+            if has_global_subscribers or task_id in self.subscribers:
+                notify.append(
+                    ProgressEvent.model_construct(
+                        event_id=event_id,
+                        task_id=task_id,
+                        event_type=event_type,
+                        timestamp=timestamp,
+                        data=data,
+                        message=message,
+                    )
+                )
 
-        return event_id
+        return event_ids, rows, notify
 
     async def subscribe_to_progress(self, task_id: str) -> AsyncIterator[ProgressEvent]:
         """Subscribe to progress events for a specific task."""
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
 
         if task_id not in self.subscribers:
-            self.subscribers[task_id] = []
-        self.subscribers[task_id].append(queue)
+            self.subscribers[task_id] = set()
+        self.subscribers[task_id].add(queue)
 
         try:
             while True:
@@ -168,19 +275,18 @@ class ProgressPublisher:
                 yield event
         finally:
             if task_id in self.subscribers:
-                if queue in self.subscribers[task_id]:
-                    self.subscribers[task_id].remove(queue)
+                self.subscribers[task_id].discard(queue)
                 if not self.subscribers[task_id]:
                     del self.subscribers[task_id]
 
     async def subscribe_to_all_progress(self) -> AsyncIterator[ProgressEvent]:
         """Subscribe to all progress events across all tasks."""
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
 
         global_key = "__ALL__"
         if global_key not in self.subscribers:
-            self.subscribers[global_key] = []
-        self.subscribers[global_key].append(queue)
+            self.subscribers[global_key] = set()
+        self.subscribers[global_key].add(queue)
 
         try:
             while True:
@@ -190,15 +296,14 @@ class ProgressPublisher:
                 yield event
         finally:
             if global_key in self.subscribers:
-                if queue in self.subscribers[global_key]:
-                    self.subscribers[global_key].remove(queue)
+                self.subscribers[global_key].discard(queue)
                 if not self.subscribers[global_key]:
                     del self.subscribers[global_key]
 
-    async def get_task_events(
+    async def iter_task_events(
         self, task_id: str, limit: Optional[int] = None
-    ) -> List[ProgressEvent]:
-        """Get progress events for a specific task."""
+    ) -> AsyncIterator[ProgressEvent]:
+        """Yield progress events for a specific task, newest first."""
         await self.initialize()
 
         query = (
@@ -210,51 +315,65 @@ class ProgressPublisher:
             query += " LIMIT ?"
             params.append(limit)
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                return [self._row_to_event(row) for row in rows]
+        await self.flush()
+        db = await self._connection.get()
+        async with db.execute(query, params) as cursor:
+            async for row in cursor:
+                yield self._row_to_event(row)
 
-    async def get_recent_events(self, limit: int = 100) -> List[ProgressEvent]:
-        """Get recent progress events across all tasks."""
+    async def get_task_events(
+        self, task_id: str, limit: Optional[int] = None
+    ) -> List[ProgressEvent]:
+        """Get progress events for a specific task."""
+        return [event async for event in self.iter_task_events(task_id, limit)]
+
+    async def iter_recent_events(
+        self, limit: int = 100
+    ) -> AsyncIterator[ProgressEvent]:
+        """Yield recent progress events across all tasks, newest first."""
         await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT * FROM progress_events ORDER BY timestamp DESC LIMIT ?",
-                [limit],
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [self._row_to_event(row) for row in rows]
+        await self.flush()
+        db = await self._connection.get()
+        async with db.execute(
+            "SELECT * FROM progress_events ORDER BY timestamp DESC LIMIT ?",
+            [limit],
+        ) as cursor:
+            async for row in cursor:
+                yield self._row_to_event(row)
+
+    async def get_recent_events(self, limit: int = 100) -> List[ProgressEvent]:
+        """Get recent progress events across all tasks."""
+        return [event async for event in self.iter_recent_events(limit)]
 
     async def get_task_summary(self, task_id: str) -> Optional[TaskSummary]:
         """Get a comprehensive summary of task progress."""
         await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", [task_id]
-            ) as cursor:
-                task_row = await cursor.fetchone()
-
-            if not task_row:
-                return None
-
-            chunks = []
-            async with db.execute(
-                "SELECT * FROM chunks WHERE chunk_id LIKE ?", [f"{task_id}_%"]
-            ) as cursor:
-                chunk_rows = await cursor.fetchall()
-
-                for chunk_row in chunk_rows:
-                    chunk_progress = ChunkProgress(
-                        chunk_id=chunk_row[0],
-                        status=chunk_row[2],
-                        description=chunk_row[1],
-                        files_affected=json.loads(chunk_row[4]),
-                        pr_number=chunk_row[6],
-                    )
-                    chunks.append(chunk_progress)
+        db = await self._connection.get()
+        async with db.execute(
+            "SELECT * FROM tasks WHERE task_id = ?", [task_id]
+        ) as cursor:
+            task_row = await cursor.fetchone()
+
+        if not task_row:
+            return None
+
+        chunks = []
+        async with db.execute(
+            "SELECT * FROM chunks WHERE chunk_id LIKE ?", [f"{task_id}_%"]
+        ) as cursor:
+            chunk_rows = await cursor.fetchall()
+
+            for chunk_row in chunk_rows:
+                chunk_progress = ChunkProgress(
+                    chunk_id=chunk_row[0],
+                    status=chunk_row[2],
+                    description=chunk_row[1],
+                    files_affected=loads(chunk_row[4]),
+                    pr_number=chunk_row[6],
+                )
+                chunks.append(chunk_progress)
 
         total_chunks = task_row[8] or len(chunks)
         completed_chunks = task_row[9] or 0
@@ -272,30 +391,66 @@ class ProgressPublisher:
             total_chunks=total_chunks,
             completed_chunks=completed_chunks,
             chunks=chunks,
-            github_prs=json.loads(task_row[10]) if task_row[10] else [],
+            github_prs=loads(task_row[10]) if task_row[10] else [],
             progress_percentage=progress_percentage,
             current_phase=current_phase,
-            created_at=datetime.fromisoformat(task_row[4]),
-            updated_at=datetime.fromisoformat(task_row[5]),
+            created_at=from_epoch_us(task_row[4]),
+            updated_at=from_epoch_us(task_row[5]),
             error_message=task_row[7],
         )
 
+    def _ensure_writer(self):
+        """Schedule the background writer on the running loop if needed.
+
+        The desktop app drives one controller from several event loops, so a
+        writer left behind on a dormant loop is replaced rather than awaited.
+        """
+        loop = asyncio.get_running_loop()
+        writer = self._writer
+        if writer is not None and not writer.done():
+            if writer.get_loop() is loop:
+                return
+            writer.cancel()
+        self._writer = loop.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        while self._pending:
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL_SECONDS)
+            try:
+                await self._write_pending()
+            except Exception as e:
+                # The batch stays buffered; the next publish restarts the writer
+                # and flush() retries it, raising if the write still fails.
+                logger.error(f"Failed to write progress events: {e}")
+                return
+
+    async def _write_pending(self):
+        """Write all buffered rows with one executemany and a single commit.
+
+        On failure the write is rolled back and the rows are put back at the
+        front of the buffer, so no progress event is lost.
+        """
+        rows, self._pending = self._pending, []
+        try:
+            async with self._connection.transaction() as db:
+                if rows:
+                    await db.executemany(_INSERT_PROGRESS_EVENT_SQL, rows)
+        except BaseException:
+            self._pending[:0] = rows
+            raise
+
     async def _notify_subscribers(self, task_id: str, event: ProgressEvent):
         """Notify all subscribers of a new progress event."""
-        if task_id in self.subscribers:
-            for queue in self.subscribers[task_id]:
-                try:
-                    queue.put_nowait(event)
-                except asyncio.QueueFull:
-                    pass
-
-        global_key = "__ALL__"
-        if global_key in self.subscribers:
-            for queue in self.subscribers[global_key]:
-                try:
-                    queue.put_nowait(event)
-                except asyncio.QueueFull:
-                    pass
+        # Copy the sets so subscribers can unsubscribe while we iterate.
+        for queue in itertools.chain(
+            list(self.subscribers.get(task_id, ())),
+            list(self.subscribers.get("__ALL__", ())),
+        ):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                queue.get_nowait()
+                queue.put_nowait(event)
 
     def _row_to_event(self, row) -> ProgressEvent:
         """Convert database row to ProgressEvent object."""
@@ -304,7 +459,7 @@ class ProgressPublisher:
             task_id=row[1],
             event_type=ProgressEventType(row[2]),
             timestamp=datetime.fromisoformat(row[3]),
-            data=json.loads(row[4]),
+            data=loads(row[4]),
             message=row[5],
         )
 
@@ -2,19 +2,104 @@
 
 import asyncio
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from pydantic import BaseModel
 
 from src.core.logger import logger
-from .task_manager import TaskManager, TaskStatus
+from .task_manager import TERMINAL_STATUSES, TaskManager, TaskStatus
 from .progress_publisher import ProgressPublisher, ProgressEventType
 from agents.coordinator import CoordinatorAgent
 from agents.feature_analyzer import FeatureAnalyzerAgent
 from agents.pr_generator import PRGeneratorAgent
 from agents.base import AgentConfig
+from core.config import GEMINI_MODELS_URL, get_http_session
 from core.events import EventBus, Event as CoreEvent, EventType as CoreEventType
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+# Progress events derived from agent events are buffered for this long and
+# then published together.
+AGENT_PROGRESS_FLUSH_INTERVAL_SECONDS = 0.05
+
+# UIs poll get_system_status frequently; a result this fresh is reused.
+SYSTEM_STATUS_TTL_SECONDS = 0.5
+
+# Successful credential validations are reused for this long.
+VALIDATION_CACHE_TTL_SECONDS = 300
+
+# Blocking validation calls get their own small pool so repeated validations
+# from the UI cannot tie up the default executor used by asyncio.to_thread.
+VALIDATION_MAX_WORKERS = 2
+
+# PyGithub clients kept for recently validated tokens.
+GITHUB_CLIENT_CACHE_SIZE = 2
+
+
+def _format_chunk_started(data: Dict[str, Any]) -> str:
+    msg_parts = [f"Chunk Started: {data.get('chunk_id', 'N/A')}"]
+    if data.get("description"):
+        msg_parts.append(f"- {data['description']}")
+    if data.get("files"):
+        msg_parts.append(f"\n   Files: {', '.join(data['files'])}")
+    return " ".join(msg_parts)
+
+
+def _format_code_generation_started(data: Dict[str, Any]) -> str:
+    message = f"Code Generation Started: Chunk {data.get('chunk_id', 'N/A')}"
+    if data.get("description"):
+        message += f" - {data['description']}"
+    return message
+
+
+def _format_files_modified(data: Dict[str, Any]) -> str:
+    files_modified = data.get("modified_files", [])
+    return f"Files Modified for chunk {data.get('chunk_id', 'N/A')}: {', '.join(files_modified) if files_modified else 'None'}"
+
+
+def _format_pr_created(data: Dict[str, Any]) -> str:
+    msg_parts = [f"PR Created: #{data.get('pr_number', 'N/A')}"]
+    if data.get("pr_title"):
+        msg_parts.append(f"- {data['pr_title']}")
+    if data.get("url"):
+        msg_parts.append(f"\n   URL: {data['url']}")
+    return " ".join(msg_parts)
+
+
+def _format_pr_merged(data: Dict[str, Any]) -> str:
+    return f"PR Merged: #{data.get('pr_number', 'N/A')} for chunk {data.get('chunk_id', 'N/A')}"
+
+
+def _format_branch_deleted(data: Dict[str, Any]) -> str:
+    return f"Branch Deleted: {data.get('branch_name', 'N/A')} for PR #{data.get('pr_number', 'N/A')}"
+
+
+# Agent events republished as task progress: core event type -> progress event
+# type and the function that renders its message from the event data.
+_AGENT_EVENT_DISPATCH: Dict[
+    CoreEventType, Tuple[ProgressEventType, Callable[[Dict[str, Any]], str]]
+] = {
+    CoreEventType.CHUNK_STARTED: (
+        ProgressEventType.CHUNK_PROCESSING_STARTED,
+        _format_chunk_started,
+    ),
+    CoreEventType.CODE_GENERATION_STARTED: (
+        ProgressEventType.AGENT_CODE_GENERATION_STARTED,
+        _format_code_generation_started,
+    ),
+    CoreEventType.FILES_MODIFIED: (
+        ProgressEventType.AGENT_FILES_MODIFIED,
+        _format_files_modified,
+    ),
+    CoreEventType.PR_CREATED: (ProgressEventType.PR_CREATED, _format_pr_created),
+    CoreEventType.PR_MERGED: (ProgressEventType.PR_MERGED, _format_pr_merged),
+    CoreEventType.BRANCH_DELETED: (
+        ProgressEventType.AGENT_BRANCH_DELETED,
+        _format_branch_deleted,
+    ),
+}
 
 
 class SystemStatus(BaseModel):
@@ -46,25 +131,60 @@ class SystemController:
         self.progress_publisher = ProgressPublisher(db_path)
 
         self.event_bus = EventBus(db_path)
+        self._subscribed_to_agent_events = False
         self.agents = {}
+        # Snapshot of self.agents.values(), rebuilt whenever the agents change,
+        # for the loops that only need the agents themselves.
+        self._agent_list: Tuple[Any, ...] = ()
         self.agent_tasks = {}
 
         self.is_running = False
         self.current_task_id: Optional[str] = None
 
+        # _task_available wakes the queue processor when a task is submitted;
+        # _stop_event is set by stop_system. Both are recreated whenever a queue
+        # processor starts, because an asyncio.Event binds to the loop that
+        # first waits on it and the desktop app switches loops between runs.
+        self._task_available = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._queue_worker: Optional[asyncio.Task] = None
+        self._agent_progress: List[tuple] = []
+        self._progress_flusher: Optional[asyncio.Task] = None
+        self._status_cache: Optional[Tuple[float, SystemStatus]] = None
+        self._gemini_validation_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._github_validation_cache: Dict[
+            Tuple[str, str], Tuple[float, Dict[str, Any]]
+        ] = {}
+        # PyGithub clients for tokens that validated, most recent last, so
+        # repeated validations reuse one HTTP session (and its pooled
+        # connections) instead of handshaking again.
+        self._gh_clients: "OrderedDict[str, Any]" = OrderedDict()
+        self._validate_pool = ThreadPoolExecutor(
+            max_workers=VALIDATION_MAX_WORKERS, thread_name_prefix="validate"
+        )
+
     async def initialize(self):
         """Initialize all system components."""
         await self.task_manager.initialize()
         await self.progress_publisher.initialize()
         await self.event_bus.initialize()
 
+        if not self._subscribed_to_agent_events:
+            for event_type in _AGENT_EVENT_DISPATCH:
+                self.event_bus.subscribe(event_type, self._handle_agent_event)
+            self._subscribed_to_agent_events = True
+            logger.info(
+                "SystemController subscribed to core agent events for progress publishing."
+            )
+
     async def start_system(self):
         """Start the agent system.
-        If called when `is_running` is already true, it assumes the previous
-        task queue processor's event loop might be dormant (due to how desktop_app.py
-        manages threads/loops) and starts a new processor on the current event loop.
+        If called when `is_running` is already true, the existing task queue
+        processor is kept if it is still alive on the current event loop. If its
+        loop is dormant (due to how desktop_app.py manages threads/loops), a new
+        processor is started on the current event loop instead.
         """
-        current_loop_id = id(asyncio.get_event_loop_policy().get_event_loop())
+        current_loop_id = id(asyncio.get_running_loop())
         logger.info(
             f"SystemController.start_system called. self.is_running: {self.is_running}. Current event loop ID: {current_loop_id}"
         )
@@ -75,21 +195,44 @@ class SystemController:
             )
             await self.initialize()
             self.is_running = True
-            logger.info(
-                "SystemController.start_system: self.is_running set to True. Starting new _process_task_queue."
-            )
-            asyncio.create_task(self._process_task_queue())
-            logger.info(
-                f"SystemController.start_system: _process_task_queue task created on loop {current_loop_id}."
+            self._status_cache = None
+            logger.info("SystemController.start_system: self.is_running set to True.")
+
+        self._ensure_queue_worker()
+
+    def _ensure_queue_worker(self):
+        """Start the task queue processor unless one is alive on this loop."""
+        loop = asyncio.get_running_loop()
+        worker = self._queue_worker
+        if worker is not None and not worker.done() and worker.get_loop() is loop:
+            logger.debug(
+                "SystemController: _process_task_queue already running on the current loop."
             )
-        else:
+            return
+
+        if worker is not None and not worker.done():
             logger.warning(
-                f"SystemController.start_system: Called while self.is_running is True. Starting a new _process_task_queue on current event loop {current_loop_id} to ensure responsiveness for new tasks from UI."
+                f"SystemController: Previous _process_task_queue is on a dormant loop. Starting a new one on loop {id(loop)}."
             )
+            worker.cancel()
 
-            asyncio.create_task(self._process_task_queue())
-            logger.info(
-                f"SystemController.start_system: Additional _process_task_queue task created on loop {current_loop_id} due to re-entry while is_running=True."
+        self._task_available = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._queue_worker = loop.create_task(self._process_task_queue())
+        self._queue_worker.add_done_callback(self._on_queue_worker_done)
+        logger.info(
+            f"SystemController.start_system: _process_task_queue task created on loop {id(loop)}."
+        )
+
+    @staticmethod
+    def _on_queue_worker_done(worker: asyncio.Task):
+        if worker.cancelled():
+            return
+        error = worker.exception()
+        if error is not None:
+            logger.error(
+                f"SystemController: _process_task_queue exited with an error: {error}",
+                exc_info=error,
             )
 
     async def stop_system(self):
@@ -98,28 +241,34 @@ class SystemController:
             return
 
         self.is_running = False
+        self._status_cache = None
+        self._stop_event.set()
+        self._task_available.set()
 
-        for agent_id, agent in self.agents.items():
+        for agent in self._agent_list:
             await agent.stop()
 
-        for task in self.agent_tasks.values():
-            if not task.done():
-                task.cancel()
+        await self._cancel_agent_tasks()
+        await self._close_agent_connections()
+        await self.event_bus.close()
+        await self._flush_agent_progress()
+        await self.progress_publisher.close()
+        await self.task_manager.close()
 
         self.agents.clear()
+        self._agent_list = ()
         self.agent_tasks.clear()
 
     async def submit_feature_task(
         self, repo_path: str, feature_specification: str
     ) -> str:
         """Submit a new feature implementation task."""
-        await self.initialize()
-
         repo_path_obj = Path(repo_path)
         if not repo_path_obj.exists():
             raise ValueError(f"Repository path does not exist: {repo_path}")
 
         task_id = await self.task_manager.submit_task(repo_path, feature_specification)
+        self._task_available.set()
 
         await self.progress_publisher.publish_progress(
             task_id,
@@ -135,9 +284,13 @@ class SystemController:
 
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a running task."""
+        # Yield once so work that is already ready (e.g. an agent's progress
+        # flush) runs before this request starts its own database round trips.
+        await asyncio.sleep(0)
         success = await self.task_manager.cancel_task(task_id)
 
         if success:
+            await self._flush_agent_progress()
             await self.progress_publisher.publish_progress(
                 task_id,
                 ProgressEventType.TASK_CANCELLED,
@@ -149,18 +302,33 @@ class SystemController:
 
     async def get_system_status(self) -> SystemStatus:
         """Get current system status."""
-        active_tasks = await self.task_manager.get_active_tasks()
-        agents_running = sum(1 for agent in self.agents.values() if agent.running)
+        now = time.monotonic()
+        if (
+            self._status_cache is not None
+            and now - self._status_cache[0] < SYSTEM_STATUS_TTL_SECONDS
+        ):
+            return self._status_cache[1]
+
+        await asyncio.sleep(0)
+        status_breakdown = await self.task_manager.get_status_breakdown()
+        active_tasks = sum(
+            count
+            for status, count in status_breakdown.items()
+            if status not in TERMINAL_STATUSES
+        )
+        agents_running = sum(1 for agent in self._agent_list if agent.running)
 
-        return SystemStatus(
+        status = SystemStatus(
             is_running=self.is_running,
-            active_tasks=len(active_tasks),
-            total_agents=len(self.agents),
+            active_tasks=active_tasks,
+            total_agents=len(self._agent_list),
             agents_running=agents_running,
             database_connected=await self._check_database_connection(),
             github_configured=bool(self.github_token and self.github_username),
             gemini_configured=bool(self.gemini_api_key),
         )
+        self._status_cache = (now, status)
+        return status
 
     async def get_task_status(self, task_id: str):
         """Get detailed status for a specific task."""
@@ -181,6 +349,9 @@ class SystemController:
         while self.is_running:
             task_processed_in_this_iteration = False
             try:
+                # Clear before polling so a submission that lands after the
+                # query still wakes the wait below.
+                self._task_available.clear()
                 logger.debug(
                     f"SystemController: Polling for tasks. self.current_task_id: {self.current_task_id}, self.is_running: {self.is_running}"
                 )
@@ -209,14 +380,11 @@ class SystemController:
                             )
                             if self.current_task_id == task_to_process.task_id:
                                 try:
-                                    await self.task_manager.update_task_status(
-                                        task_to_process.task_id,
-                                        TaskStatus.FAILED,
-                                        error_message=f"SystemController error during processing: {str(e_single_task)}",
-                                    )
-                                    await self.progress_publisher.publish_progress(
+                                    await self._flush_agent_progress()
+                                    await self.task_manager.fail_task_with_progress(
                                         task_to_process.task_id,
-                                        ProgressEventType.TASK_FAILED,
+                                        f"SystemController error during processing: {str(e_single_task)}",
+                                        self.progress_publisher,
                                         {
                                             "error": f"SystemController error: {str(e_single_task)}"
                                         },
@@ -245,7 +413,7 @@ class SystemController:
                     )
 
                 if not task_processed_in_this_iteration or self.current_task_id:
-                    await asyncio.sleep(1)
+                    await self._task_available.wait()
 
             except Exception as e_queue_loop:
                 logger.error(
@@ -272,48 +440,56 @@ class SystemController:
 
             await self._create_agents_for_task(task)
 
-            for agent_id, agent in self.agents.items():
-                await agent.initialize_agent()
-                logger.info(
-                    f"✅ Agent {agent_id} initialized and event subscriptions set up"
-                )
+            # The agents' setups are independent, so run them concurrently.
+            await asyncio.gather(
+                *(agent.initialize_agent() for agent in self._agent_list)
+            )
+            logger.info(
+                f"✅ Agents {', '.join(self.agents)} initialized and event subscriptions set up"
+            )
 
-            agent_start_tasks = []
-            for agent_id, agent in self.agents.items():
-                agent_start_tasks.append(asyncio.create_task(agent.start()))
-                self.agent_tasks[agent_id] = agent_start_tasks[-1]
+            self.agent_tasks.update(
+                (agent_id, asyncio.create_task(agent.start()))
+                for agent_id, agent in self.agents.items()
+            )
 
-            await asyncio.sleep(0.5)
+            await self._wait_for_agents_ready()
 
             coordinator = self.agents.get("coordinator")
             if coordinator:
                 await coordinator.start_feature_processing(task.feature_specification)
 
-                while coordinator.running and self.is_running:
-                    await asyncio.sleep(1)
+                done_wait = asyncio.create_task(coordinator.done_event.wait())
+                stop_wait = asyncio.create_task(self._stop_event.wait())
+                try:
+                    await asyncio.wait(
+                        {done_wait, stop_wait}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    done_wait.cancel()
+                    stop_wait.cancel()
 
                 if coordinator.running:
                     await self.task_manager.update_task_status(
                         task.task_id, TaskStatus.CANCELLED
                     )
                 else:
-                    await self.task_manager.update_task_status(
-                        task.task_id, TaskStatus.COMPLETED
-                    )
-                    await self.progress_publisher.publish_progress(
+                    await self._flush_agent_progress()
+                    await self.task_manager.finish_task_with_progress(
                         task.task_id,
+                        TaskStatus.COMPLETED,
+                        self.progress_publisher,
                         ProgressEventType.TASK_COMPLETED,
                         {},
                         message="Feature implementation completed successfully",
                     )
 
         except Exception as e:
-            await self.task_manager.update_task_status(
-                task.task_id, TaskStatus.FAILED, error_message=str(e)
-            )
-            await self.progress_publisher.publish_progress(
+            await self._flush_agent_progress()
+            await self.task_manager.fail_task_with_progress(
                 task.task_id,
-                ProgressEventType.TASK_FAILED,
+                str(e),
+                self.progress_publisher,
                 {"error": str(e)},
                 message=f"Task failed: {str(e)}",
             )
@@ -330,13 +506,26 @@ class SystemController:
                 f"SystemController: Exiting _process_single_task for task {task_id_for_log} after _cleanup_agents."
             )
 
+    async def _wait_for_agents_ready(self):
+        """Wait until every agent has entered its run loop.
+
+        An agent whose task ends before becoming ready (e.g. it failed during
+        start-up) is not waited on further.
+        """
+        for agent_id, agent in self.agents.items():
+            ready_wait = asyncio.create_task(agent.ready.wait())
+            try:
+                await asyncio.wait(
+                    {ready_wait, self.agent_tasks[agent_id]},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                ready_wait.cancel()
+
     async def _create_agents_for_task(self, task):
         """Create and configure agents for processing a task."""
         await self._cleanup_agents()
 
-        shared_event_bus = EventBus(self.db_path)
-        await shared_event_bus.initialize()
-
         self.agents["coordinator"] = CoordinatorAgent(
             AgentConfig(
                 agent_id="coordinator",
@@ -344,7 +533,7 @@ class SystemController:
                 gemini_api_key=self.gemini_api_key,
             ),
             task.repo_path,
-            shared_event_bus=shared_event_bus,
+            shared_event_bus=self.event_bus,
         )
 
         self.agents["feature_analyzer"] = FeatureAnalyzerAgent(
@@ -353,7 +542,7 @@ class SystemController:
                 event_bus_db_path=self.db_path,
                 gemini_api_key=self.gemini_api_key,
             ),
-            shared_event_bus=shared_event_bus,
+            shared_event_bus=self.event_bus,
         )
 
         repo_name = os.getenv("GITHUB_REPO_NAME") or Path(task.repo_path).name
@@ -368,27 +557,10 @@ class SystemController:
             self.github_token,
             self.github_username,
             repo_name,
-            shared_event_bus=shared_event_bus,
+            shared_event_bus=self.event_bus,
         )
 
-        shared_event_bus.subscribe(
-            CoreEventType.CHUNK_STARTED, self._handle_agent_event
-        )
-        shared_event_bus.subscribe(
-            CoreEventType.CODE_GENERATION_STARTED, self._handle_agent_event
-        )
-        shared_event_bus.subscribe(
-            CoreEventType.FILES_MODIFIED, self._handle_agent_event
-        )
-        shared_event_bus.subscribe(CoreEventType.PR_CREATED, self._handle_agent_event)
-        shared_event_bus.subscribe(CoreEventType.PR_MERGED, self._handle_agent_event)
-        shared_event_bus.subscribe(
-            CoreEventType.BRANCH_DELETED, self._handle_agent_event
-        )
-
-        logger.info(
-            "SystemController subscribed to core agent events for progress publishing."
-        )
+        self._agent_list = tuple(self.agents.values())
 
     async def _handle_agent_event(self, core_event: CoreEvent):
         """Handles core agent events and publishes them as progress events."""
@@ -402,97 +574,99 @@ class SystemController:
             f"SystemController handling core event: {core_event.event_type} for task {self.current_task_id}"
         )
 
-        progress_event_type: Optional[ProgressEventType] = None
-        message: Optional[str] = None
-        data = core_event.data.copy()
-
-        if core_event.event_type == CoreEventType.CHUNK_STARTED:
-            progress_event_type = ProgressEventType.CHUNK_PROCESSING_STARTED
-            msg_parts = [f"Chunk Started: {data.get('chunk_id', 'N/A')}"]
-            if data.get("description"):
-                msg_parts.append(f"- {data.get('description')}")
-            if data.get("files"):
-                msg_parts.append(f"\n   Files: {', '.join(data.get('files'))}")
-            message = " ".join(msg_parts)
-
-        elif core_event.event_type == CoreEventType.CODE_GENERATION_STARTED:
-            progress_event_type = ProgressEventType.AGENT_CODE_GENERATION_STARTED
-            message = f"Code Generation Started: Chunk {data.get('chunk_id', 'N/A')}"
-            if data.get("description"):
-                message += f" - {data.get('description')}"
-
-        elif core_event.event_type == CoreEventType.FILES_MODIFIED:
-            progress_event_type = ProgressEventType.AGENT_FILES_MODIFIED
-            files_modified = data.get("modified_files", [])
-            message = f"Files Modified for chunk {data.get('chunk_id', 'N/A')}: {', '.join(files_modified) if files_modified else 'None'}"
-
-        elif core_event.event_type == CoreEventType.PR_CREATED:
-            progress_event_type = ProgressEventType.PR_CREATED
-            msg_parts = [f"PR Created: #{data.get('pr_number', 'N/A')}"]
-            if data.get("pr_title"):
-                msg_parts.append(f"- {data.get('pr_title')}")
-            if data.get("url"):
-                msg_parts.append(f"\n   URL: {data.get('url')}")
-            message = " ".join(msg_parts)
-
-        elif core_event.event_type == CoreEventType.PR_MERGED:
-            progress_event_type = ProgressEventType.PR_MERGED
-            message = f"PR Merged: #{data.get('pr_number', 'N/A')} for chunk {data.get('chunk_id', 'N/A')}"
-
-        elif core_event.event_type == CoreEventType.BRANCH_DELETED:
-            progress_event_type = ProgressEventType.AGENT_BRANCH_DELETED
-            message = f"Branch Deleted: {data.get('branch_name', 'N/A')} for PR #{data.get('pr_number', 'N/A')}"
-
-        else:
+        entry = _AGENT_EVENT_DISPATCH.get(core_event.event_type)
+        if entry is None:
             logger.debug(
                 f"Unhandled core event type by SystemController: {core_event.event_type}"
             )
             return
 
-        if progress_event_type:
-            try:
-                await self.progress_publisher.publish_progress(
-                    task_id=self.current_task_id,
-                    event_type=progress_event_type,
-                    data=data,
-                    message=message,
-                )
-                logger.info(
-                    f"Published progress event {progress_event_type.value} for task {self.current_task_id}"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error publishing progress event from SystemController: {e}",
-                    exc_info=True,
-                )
+        # The publisher only serializes the data, so the event's dict is passed
+        # through as-is rather than copied per event.
+        progress_event_type, format_message = entry
+        data = core_event.data
+        self._agent_progress.append(
+            (self.current_task_id, progress_event_type, data, format_message(data))
+        )
+        self._ensure_progress_flusher()
+
+    def _ensure_progress_flusher(self):
+        """Schedule a flush of buffered agent progress on the running loop."""
+        loop = asyncio.get_running_loop()
+        flusher = self._progress_flusher
+        if flusher is not None and not flusher.done() and flusher.get_loop() is loop:
+            return
+        self._progress_flusher = loop.create_task(self._progress_flush_loop())
+
+    async def _progress_flush_loop(self):
+        while self._agent_progress:
+            await asyncio.sleep(AGENT_PROGRESS_FLUSH_INTERVAL_SECONDS)
+            await self._flush_agent_progress()
+
+    async def _flush_agent_progress(self):
+        """Publish all buffered agent progress events in one batch.
+
+        Called before terminal task events so they are never published ahead
+        of the agent progress that preceded them.
+        """
+        events, self._agent_progress = self._agent_progress, []
+        if not events:
+            return
+        try:
+            await self.progress_publisher.publish_progress_batch(events)
+            logger.info(f"Published {len(events)} agent progress events")
+        except Exception as e:
+            logger.error(
+                f"Error publishing progress events from SystemController: {e}",
+                exc_info=True,
+            )
 
     async def _cleanup_agents(self):
         """Clean up all agents and their tasks."""
-        for agent in self.agents.values():
+        for agent in self._agent_list:
             try:
                 await agent.stop()
             except Exception as e:
                 logger.error(f"Error stopping agent: {e}")
 
-        for task in self.agent_tasks.values():
-            if not task.done():
-                task.cancel()
+        await self._cancel_agent_tasks()
+        await self._close_agent_connections()
 
         self.agents.clear()
+        self._agent_list = ()
         self.agent_tasks.clear()
 
+    async def _cancel_agent_tasks(self):
+        """Cancel the agents' run loops and wait for them to finish.
+
+        Waiting ensures no agent is still using its connections when they are
+        closed. Tasks left on another (dormant) loop can only be cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self.agent_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(
+            *(task for task in tasks if task.get_loop() is loop),
+            return_exceptions=True,
+        )
+
+    async def _close_agent_connections(self):
+        """Close database connections and event subscriptions held by the agents."""
+        for agent in self._agent_list:
+            try:
+                await agent.close()
+            except Exception as e:
+                logger.error(f"Error closing agent connections: {e}")
+
     async def _check_database_connection(self) -> bool:
         """Check if database connection is working."""
-        try:
-            await self.task_manager.initialize()
-            return True
-        except Exception:
-            return False
+        return await self.task_manager.is_alive()
 
     async def validate_gemini_api_key(
         self, api_key_to_validate: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Validate the Gemini API key by making a test call."""
+        """Validate the Gemini API key by listing the models it can access."""
         key = (
             api_key_to_validate
             if api_key_to_validate is not None
@@ -506,50 +680,64 @@ class SystemController:
                 "status_code": None,
             }
 
-        def sync_validate_with_langchain(api_key: str):
-            try:
+        cached = self._gemini_validation_cache.get(key)
+        if cached and time.monotonic() - cached[0] < VALIDATION_CACHE_TTL_SECONDS:
+            return cached[1]
 
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-2.5-flash-preview-05-20",
-                    google_api_key=api_key,
-                    temperature=0.0,
+        def sync_validate_api_key(api_key: str):
+            # Listing a single model is one authenticated GET with no token
+            # generation, which is all that is needed to prove the key works.
+            import requests
+
+            key_suffix = api_key[-4:] if len(api_key) >= 4 else "INVALID_LENGTH"
+            try:
+                response = get_http_session().get(
+                    GEMINI_MODELS_URL,
+                    headers={"x-goog-api-key": api_key},
+                    params={"pageSize": 1},
+                    timeout=10,
                 )
+            except requests.RequestException as e:
+                logger.warning(
+                    f"Gemini API key validation failed for key ending ...{key_suffix}: {type(e).__name__} - {str(e)}"
+                )
+                return {
+                    "valid": False,
+                    "message": f"Validation failed: {type(e).__name__}.",
+                    "status_code": None,
+                }
 
-                llm.invoke("test")
+            if response.ok:
                 return {
                     "valid": True,
                     "message": "Gemini API key is valid.",
                     "status_code": 200,
                 }
 
-            except Exception as e:
-
-                key_suffix = api_key[-4:] if len(api_key) >= 4 else "INVALID_LENGTH"
-                logger.warning(
-                    f"Gemini API key validation failed for key ending ...{key_suffix}: {type(e).__name__} - {str(e)}"
-                )
-
-                status_code = getattr(e, "code", getattr(e, "status_code", None))
+            status_code = response.status_code
+            logger.warning(
+                f"Gemini API key validation failed for key ending ...{key_suffix}: HTTP {status_code} - {response.text}"
+            )
 
-                user_message = f"Validation failed: {type(e).__name__}."
-                if "API key not valid" in str(e) or (
-                    hasattr(e, "args")
-                    and e.args
-                    and "API key not valid" in str(e.args[0])
-                ):
-                    user_message = "API key not valid. Please check your key."
-                elif status_code == 403:
-                    user_message = "Permission denied. The API key may not have access to the Gemini API."
-                elif status_code == 400:
-                    user_message = "Bad request. The API key might be malformed or the model is not accessible with this key."
+            user_message = f"Validation failed: HTTP {status_code}."
+            if "API key not valid" in response.text:
+                user_message = "API key not valid. Please check your key."
+            elif status_code == 403:
+                user_message = "Permission denied. The API key may not have access to the Gemini API."
+            elif status_code == 400:
+                user_message = "Bad request. The API key might be malformed."
 
-                return {
-                    "valid": False,
-                    "message": user_message,
-                    "status_code": status_code,
-                }
+            return {
+                "valid": False,
+                "message": user_message,
+                "status_code": status_code,
+            }
 
-        result = await asyncio.to_thread(sync_validate_with_langchain, key)
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._validate_pool, sync_validate_api_key, key
+        )
+        if result["valid"]:
+            self._gemini_validation_cache[key] = (time.monotonic(), result)
         return result
 
     async def validate_github_credentials(
@@ -566,12 +754,21 @@ class SystemController:
         if not username_to_validate:
             return {"valid": False, "message": "GitHub username is not provided."}
 
+        cache_key = (token_to_validate, username_to_validate.lower())
+        cached = self._github_validation_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < VALIDATION_CACHE_TTL_SECONDS:
+            return cached[1]
+
         from github import Github, BadCredentialsException, GithubException
 
+        # Constructing a client does no network I/O; only get_user() below does.
+        client = self._gh_clients.get(token_to_validate)
+        if client is None:
+            client = Github(token_to_validate)
+
         def sync_validate_github(gh_token: str, gh_username: str):
             try:
-                g = Github(gh_token)
-                user = g.get_user()
+                user = client.get_user()
 
                 if user.login.lower() != gh_username.lower():
                     logger.warning(
@@ -615,7 +812,20 @@ class SystemController:
                 )
                 return {"valid": False, "message": f"Unexpected error: {str(e)}"}
 
-        result = await asyncio.to_thread(
-            sync_validate_github, token_to_validate, username_to_validate
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._validate_pool,
+            sync_validate_github,
+            token_to_validate,
+            username_to_validate,
         )
+        if result["valid"]:
+            self._github_validation_cache[cache_key] = (time.monotonic(), result)
+            self._remember_gh_client(token_to_validate, client)
         return result
+
+    def _remember_gh_client(self, token: str, client: Any):
+        """Keep the client of a validated token, evicting the least recent."""
+        self._gh_clients[token] = client
+        self._gh_clients.move_to_end(token)
+        while len(self._gh_clients) > GITHUB_CLIENT_CACHE_SIZE:
+            self._gh_clients.popitem(last=False)
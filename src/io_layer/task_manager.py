@@ -1,13 +1,65 @@
 """Task management for the agent system."""
 
 import asyncio
-import json
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, AsyncIterator
+from typing import Any, Dict, List, Optional, AsyncIterator
 from pydantic import BaseModel
-import aiosqlite
+
+from core.database import (
+    ConnectionPool,
+    from_epoch_us,
+    migrate_iso_timestamp_columns,
+    to_epoch_us,
+)
+from core.serialization import dumps, loads
+from .progress_publisher import ProgressEventType, ProgressPublisher
+
+
+# Timestamps are stored as integer microseconds since the Unix epoch.
+_CREATE_TASKS_SQL = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        task_id TEXT PRIMARY KEY,
+        repo_path TEXT NOT NULL,
+        feature_specification TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        completed_at INTEGER,
+        error_message TEXT,
+        total_chunks INTEGER,
+        completed_chunks INTEGER DEFAULT 0,
+        github_prs TEXT DEFAULT '[]'
+    )
+"""
+
+# Column order read by TaskManager._row_to_task.
+_TASK_COLUMNS = (
+    "task_id, repo_path, feature_specification, status, created_at, updated_at, "
+    "completed_at, error_message, total_chunks, completed_chunks, github_prs"
+)
+
+# Statements are kept as constant strings so sqlite3's per-connection statement
+# cache (connections are pooled) reuses their prepared form across calls.
+_INSERT_TASK_SQL = f"INSERT INTO tasks ({_TASK_COLUMNS}) VALUES ({', '.join('?' * 11)})"
+_SELECT_TASK_SQL = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE task_id = ?"
+_SELECT_TASKS_SQL = f"SELECT {_TASK_COLUMNS} FROM tasks ORDER BY created_at ASC"
+_SELECT_TASKS_BY_STATUS_SQL = (
+    f"SELECT {_TASK_COLUMNS} FROM tasks WHERE status = ? ORDER BY created_at ASC"
+)
+_COUNT_TASKS_BY_STATUS_SQL = "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+# One statement for every status update; a NULL parameter keeps the stored
+# value, and completed_at is only passed for terminal statuses.
+_UPDATE_TASK_STATUS_SQL = (
+    "UPDATE tasks SET status = ?, updated_at = ?, "
+    "error_message = COALESCE(?, error_message), "
+    "total_chunks = COALESCE(?, total_chunks), "
+    "completed_chunks = COALESCE(?, completed_chunks), "
+    "github_prs = COALESCE(?, github_prs), "
+    "completed_at = COALESCE(?, completed_at) "
+    "WHERE task_id = ?"
+)
 
 
 class TaskStatus(str, Enum):
@@ -21,6 +73,25 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses a task never leaves; reaching one stamps completed_at.
+TERMINAL_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+)
+# Query parameters for get_active_tasks; plain strings need no adaptation.
+_ACTIVE_STATUSES = (
+    TaskStatus.QUEUED.value,
+    TaskStatus.ANALYZING.value,
+    TaskStatus.CHUNKING.value,
+    TaskStatus.PROCESSING_CHUNKS.value,
+    TaskStatus.MERGING.value,
+)
+_SELECT_ACTIVE_TASKS_SQL = (
+    f"SELECT {_TASK_COLUMNS} FROM tasks "
+    f"WHERE status IN ({','.join('?' * len(_ACTIVE_STATUSES))}) "
+    "ORDER BY created_at ASC"
+)
+
+
 class Task(BaseModel):
     task_id: str
     repo_path: str
@@ -44,72 +115,95 @@ class TaskManager:
     def __init__(self, db_path: str = "coordination.db"):
         self.db_path = db_path
         self.active_tasks: Dict[str, asyncio.Task] = {}
+        # SQLite allows one writer at a time, so writes share a single
+        # connection; reads get their own pool and never queue behind them.
+        self._write_pool = ConnectionPool(db_path, max_size=1)
+        self._read_pool = ConnectionPool(db_path, max_idle=4, query_only=True)
         self._initialized = False
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self):
-        """Initialize the task management database tables."""
+        """Initialize the task management database tables.
+
+        Runs the DDL once per instance; later calls return immediately. The
+        controller calls this at start-up; query methods check `_initialized`
+        inline so the common already-initialized case costs no extra await.
+        """
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id TEXT PRIMARY KEY,
-                    repo_path TEXT NOT NULL,
-                    feature_specification TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    completed_at TEXT,
-                    error_message TEXT,
-                    total_chunks INTEGER,
-                    completed_chunks INTEGER DEFAULT 0,
-                    github_prs TEXT DEFAULT '[]'
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            # Pooled connections apply the shared pragmas, switching the
+            # database to WAL.
+            async with self._write_pool.connection() as db:
+                await db.execute(_CREATE_TASKS_SQL)
+                # Timestamps used to be stored as ISO strings; convert older
+                # databases before (re)creating the indexes.
+                await migrate_iso_timestamp_columns(
+                    db,
+                    "tasks",
+                    ("created_at", "updated_at", "completed_at"),
+                    _CREATE_TASKS_SQL,
                 )
-            """
-            )
-            await db.commit()
+                # Status filters with created_at ordering (the queue poll and
+                # get_active_tasks) and the unfiltered created_at listing are
+                # both answered from an index instead of a scan and sort.
+                await db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)"
+                )
+                await db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at)"
+                )
+                await db.commit()
+            self._initialized = True
+
+    async def is_alive(self) -> bool:
+        """Cheap liveness check on a pooled connection.
+
+        PRAGMA user_version is answered from the database header, so this does
+        not re-open the file or prepare a query against any table.
+        """
+        try:
+            async with self._read_pool.connection() as db:
+                async with db.execute("PRAGMA user_version") as cursor:
+                    await cursor.fetchone()
+            return True
+        except Exception:
+            return False
 
-        self._initialized = True
+    async def close(self):
+        """Close the pooled database connections."""
+        await self._write_pool.close()
+        await self._read_pool.close()
 
     async def submit_task(self, repo_path: str, feature_specification: str) -> str:
         """Submit a new task for processing."""
-        await self.initialize()
-
-        task_id = str(uuid.uuid4())
-        now = datetime.now()
-
-        task = Task(
-            task_id=task_id,
-            repo_path=repo_path,
-            feature_specification=feature_specification,
-            status=TaskStatus.QUEUED,
-            created_at=now,
-            updated_at=now,
-        )
+        if not self._initialized:
+            await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        task_id = uuid.uuid4().hex
+        now = to_epoch_us(datetime.now())
+
+        # A new task is fully determined here, so bind the row directly
+        # rather than validating a Task model only to read it back.
+        async with self._write_pool.connection() as db:
             await db.execute(
-                """
-                INSERT INTO tasks (
-                    task_id, repo_path, feature_specification, status,
-                    created_at, updated_at, completed_at, error_message,
-                    total_chunks, completed_chunks, github_prs
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+                _INSERT_TASK_SQL,
                 (
-                    task.task_id,
-                    task.repo_path,
-                    task.feature_specification,
-                    task.status,
-                    task.created_at.isoformat(),
-                    task.updated_at.isoformat(),
-                    task.completed_at.isoformat() if task.completed_at else None,
-                    task.error_message,
-                    task.total_chunks,
-                    task.completed_chunks,
-                    json.dumps(task.github_prs),
+                    task_id,
+                    repo_path,
+                    feature_specification,
+                    TaskStatus.QUEUED.value,
+                    now,
+                    now,
+                    None,
+                    None,
+                    None,
+                    0,
+                    "[]",
                 ),
             )
             await db.commit()
@@ -126,48 +220,96 @@ class TaskManager:
         github_prs: Optional[List[int]] = None,
     ):
         """Update task status and related fields."""
-        await self.initialize()
-
-        now = datetime.now()
-        updates = ["status = ?", "updated_at = ?"]
-        params = [status, now.isoformat()]
-
-        if error_message is not None:
-            updates.append("error_message = ?")
-            params.append(error_message)
+        if not self._initialized:
+            await self.initialize()
 
-        if total_chunks is not None:
-            updates.append("total_chunks = ?")
-            params.append(total_chunks)
+        params = self._status_update_params(
+            task_id, status, error_message, total_chunks, completed_chunks, github_prs
+        )
 
-        if completed_chunks is not None:
-            updates.append("completed_chunks = ?")
-            params.append(completed_chunks)
+        async with self._write_pool.connection() as db:
+            await db.execute(_UPDATE_TASK_STATUS_SQL, params)
+            await db.commit()
 
-        if github_prs is not None:
-            updates.append("github_prs = ?")
-            params.append(json.dumps(github_prs))
+    async def finish_task_with_progress(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        progress_publisher: ProgressPublisher,
+        event_type: ProgressEventType,
+        data: Dict[str, Any],
+        message: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ) -> str:
+        """Update a task's status and publish its progress event in one commit.
+
+        Returns the id of the published progress event.
+        """
+        if not self._initialized:
+            await self.initialize()
+        await progress_publisher.initialize()
+        await progress_publisher.flush()
+
+        params = self._status_update_params(task_id, status, error_message)
+
+        async with self._write_pool.connection() as db:
+            await db.execute(_UPDATE_TASK_STATUS_SQL, params)
+            event_ids, staged = await progress_publisher.stage_progress_batch(
+                db, [(task_id, event_type, data, message)]
+            )
+            await db.commit()
 
-        if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-            updates.append("completed_at = ?")
-            params.append(now.isoformat())
+        await progress_publisher.notify_staged(staged)
+        return event_ids[0]
 
-        params.append(task_id)
+    async def fail_task_with_progress(
+        self,
+        task_id: str,
+        error_message: str,
+        progress_publisher: ProgressPublisher,
+        data: Dict[str, Any],
+        message: Optional[str] = None,
+    ) -> str:
+        """Mark a task as failed and publish TASK_FAILED in one commit."""
+        return await self.finish_task_with_progress(
+            task_id,
+            TaskStatus.FAILED,
+            progress_publisher,
+            ProgressEventType.TASK_FAILED,
+            data,
+            message,
+            error_message=error_message,
+        )
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                f"UPDATE tasks SET {', '.join(updates)} WHERE task_id = ?", params
-            )
-            await db.commit()
+    @staticmethod
+    def _status_update_params(
+        task_id: str,
+        status: TaskStatus,
+        error_message: Optional[str] = None,
+        total_chunks: Optional[int] = None,
+        completed_chunks: Optional[int] = None,
+        github_prs: Optional[List[int]] = None,
+    ) -> tuple:
+        """Parameters for _UPDATE_TASK_STATUS_SQL; None leaves a field unchanged."""
+        now = to_epoch_us(datetime.now())
+        return (
+            status,
+            now,
+            error_message,
+            total_chunks,
+            completed_chunks,
+            dumps(github_prs) if github_prs is not None else None,
+            now if status in TERMINAL_STATUSES else None,
+            task_id,
+        )
 
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a specific task by ID."""
-        await self.initialize()
+        if not self._initialized:
+            await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", [task_id]
-            ) as cursor:
+        async with self._read_pool.connection() as db:
+            async with db.execute(_SELECT_TASK_SQL, [task_id]) as cursor:
                 row = await cursor.fetchone()
 
                 if row:
@@ -178,57 +320,51 @@ class TaskManager:
         self, status: Optional[TaskStatus] = None, limit: Optional[int] = None
     ) -> List[Task]:
         """Get tasks, optionally filtered by status."""
-        await self.initialize()
-
-        query = "SELECT * FROM tasks"
-        params = []
+        if not self._initialized:
+            await self.initialize()
 
         if status:
-            query += " WHERE status = ?"
-            params.append(status)
-
-        query += " ORDER BY created_at ASC"
+            query = _SELECT_TASKS_BY_STATUS_SQL
+            params = [status]
+        else:
+            query = _SELECT_TASKS_SQL
+            params = []
 
         if limit:
             query += " LIMIT ?"
             params.append(limit)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._read_pool.connection() as db:
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 return [self._row_to_task(row) for row in rows]
 
     async def get_active_tasks(self) -> List[Task]:
         """Get currently active (non-terminal) tasks."""
-        active_statuses = [
-            TaskStatus.QUEUED,
-            TaskStatus.ANALYZING,
-            TaskStatus.CHUNKING,
-            TaskStatus.PROCESSING_CHUNKS,
-            TaskStatus.MERGING,
-        ]
+        if not self._initialized:
+            await self.initialize()
 
-        await self.initialize()
-
-        placeholders = ",".join("?" * len(active_statuses))
-        query = f"SELECT * FROM tasks WHERE status IN ({placeholders}) ORDER BY created_at ASC"
-
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(query, active_statuses) as cursor:
+        async with self._read_pool.connection() as db:
+            async with db.execute(_SELECT_ACTIVE_TASKS_SQL, _ACTIVE_STATUSES) as cursor:
                 rows = await cursor.fetchall()
                 return [self._row_to_task(row) for row in rows]
 
+    async def get_status_breakdown(self) -> Dict[str, int]:
+        """Count tasks per status, aggregated in SQL from the status index."""
+        if not self._initialized:
+            await self.initialize()
+
+        async with self._read_pool.connection() as db:
+            async with db.execute(_COUNT_TASKS_BY_STATUS_SQL) as cursor:
+                return {status: count async for status, count in cursor}
+
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a task if it's not already completed."""
         task = await self.get_task(task_id)
         if not task:
             return False
 
-        if task.status in [
-            TaskStatus.COMPLETED,
-            TaskStatus.FAILED,
-            TaskStatus.CANCELLED,
-        ]:
+        if task.status in TERMINAL_STATUSES:
             return False
 
         if task_id in self.active_tasks:
@@ -240,16 +376,17 @@ class TaskManager:
 
     def _row_to_task(self, row) -> Task:
         """Convert database row to Task object."""
-        return Task(
+        # Rows come from our own schema; skip re-validating them.
+        return Task.model_construct(
             task_id=row[0],
             repo_path=row[1],
             feature_specification=row[2],
             status=TaskStatus(row[3]),
-            created_at=datetime.fromisoformat(row[4]),
-            updated_at=datetime.fromisoformat(row[5]),
-            completed_at=datetime.fromisoformat(row[6]) if row[6] else None,
+            created_at=from_epoch_us(row[4]),
+            updated_at=from_epoch_us(row[5]),
+            completed_at=from_epoch_us(row[6]) if row[6] else None,
             error_message=row[7],
             total_chunks=row[8],
             completed_chunks=row[9] or 0,
-            github_prs=json.loads(row[10]) if row[10] else [],
+            github_prs=loads(row[10]) if row[10] else [],
         )
@@ -1,10 +1,11 @@
 import asyncio
 import os
 import argparse
-from typing import Optional
+from typing import List, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
+from rich.text import Text
 import signal
 
 
@@ -25,11 +26,26 @@ from agents.base import AgentConfig
 from agents.coordinator import CoordinatorAgent
 from agents.feature_analyzer import FeatureAnalyzerAgent
 from agents.pr_generator import PRGeneratorAgent
+from core.coordination import ChunkStatus
+from core.event_loop import install_uvloop
 from core.events import EventBus
 from core.logger import logger
 
 console = Console()
 
+STATUS_TABLE_TITLE = "PR Automation System Status"
+CHUNK_STATUSES = (
+    ChunkStatus.PLANNED,
+    ChunkStatus.IN_PROGRESS,
+    ChunkStatus.COMPLETE,
+    ChunkStatus.MERGED,
+)
+STATUS_TABLE_ROWS = [
+    ("total_chunks", "Total Chunks"),
+    ("chunks_created", "Chunks Created"),
+    ("current_feature", "Feature Active"),
+] + [(status_name, f"  {status_name.title()}") for status_name in CHUNK_STATUSES]
+
 
 class PRAutomationSystem:
     def __init__(
@@ -88,6 +104,9 @@ class PRAutomationSystem:
         ]
 
         self.running = False
+        self._run_tasks: List[asyncio.Task] = []
+
+        self._status_table, self._status_cells = self._build_status_table()
 
     async def start(self):
         logger.info("Starting Automaton System...")
@@ -119,6 +138,7 @@ class PRAutomationSystem:
 
             agent_run_tasks.append(asyncio.create_task(agent.start()))
 
+        self._run_tasks = agent_run_tasks
         logger.info("All agent run loops started.")
         return agent_run_tasks
 
@@ -127,8 +147,27 @@ class PRAutomationSystem:
 
         self.running = False
 
-        for agent in self.agents:
-            await agent.stop()
+        results = await asyncio.gather(
+            *(agent.stop() for agent in self.agents), return_exceptions=True
+        )
+        for agent, result in zip(self.agents, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error stopping agent {agent.agent_id}: {result}")
+
+        # Wait for the run loops to exit before closing their connections, so
+        # an iteration still in flight cannot reopen a closed connection.
+        run_tasks, self._run_tasks = self._run_tasks, []
+        for task in run_tasks:
+            task.cancel()
+        await asyncio.gather(*run_tasks, return_exceptions=True)
+
+        results = await asyncio.gather(
+            *(agent.close() for agent in self.agents), return_exceptions=True
+        )
+        for agent, result in zip(self.agents, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error closing agent {agent.agent_id}: {result}")
+        await self.shared_event_bus.close()
 
         logger.info("All agents stopped.")
 
@@ -142,36 +181,55 @@ class PRAutomationSystem:
     async def get_status(self):
         return await self.coordinator.get_status()
 
-    def create_status_table(self, status):
-        table = Table(title="PR Automation System Status")
+    @staticmethod
+    def _build_status_table():
+        # The table is built once; refreshes rewrite the Value cells in place.
+        table = Table(title=STATUS_TABLE_TITLE)
 
         table.add_column("Metric", style="cyan")
         table.add_column("Value", style="magenta")
 
-        table.add_row("Total Chunks", str(status.get("total_chunks", 0)))
-        table.add_row("Chunks Created", str(status.get("chunks_created", False)))
-        table.add_row("Feature Active", str(status.get("current_feature", False)))
+        cells = {}
+        for key, label in STATUS_TABLE_ROWS:
+            cells[key] = Text()
+            table.add_row(label, cells[key])
+
+        return table, cells
 
+    def update_status_table(self, status):
         breakdown = status.get("status_breakdown", {})
-        for status_name, count in breakdown.items():
-            table.add_row(f"  {status_name.title()}", str(count))
+        values = {
+            "total_chunks": status.get("total_chunks", 0),
+            "chunks_created": status.get("chunks_created", False),
+            "current_feature": status.get("current_feature", False),
+        }
+        for status_name in CHUNK_STATUSES:
+            values[status_name] = breakdown.get(status_name, 0)
 
-        return table
+        for key, value in values.items():
+            self._status_cells[key].plain = str(value)
+        self._status_table.title = STATUS_TABLE_TITLE
+
+        return self._status_table
+
+    def mark_status_unavailable(self):
+        self._status_table.title = "Status Unavailable"
+        return self._status_table
 
 
 async def monitor_system(system: PRAutomationSystem):
-    def update_display():
-        status = asyncio.create_task(system.get_status())
+    async def refresh_status_table():
         try:
-            status_data = asyncio.get_event_loop().run_until_complete(status)
-            return system.create_status_table(status_data)
-        except:
-            return Table(title="Status Unavailable")
+            return system.update_status_table(await system.get_status())
+        except Exception:
+            return system.mark_status_unavailable()
 
-    with Live(update_display(), refresh_per_second=1) as live:
+    # Refreshed manually after each update, so Live needs no refresh thread.
+    with Live(await refresh_status_table(), auto_refresh=False) as live:
         while system.running:
-            live.update(update_display())
             await asyncio.sleep(1)
+            await refresh_status_table()
+            live.refresh()
 
 
 async def main():
@@ -221,37 +279,56 @@ async def main():
         gemini_api_key=gemini_api_key,
     )
 
-    def signal_handler(signum, frame):
+    loop = asyncio.get_running_loop()
+    shutdown_requested = asyncio.Event()
+
+    def request_shutdown():
         logger.warning("\nReceived shutdown signal...")
-        asyncio.create_task(system.stop())
+        shutdown_requested.set()
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_shutdown)
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers; Ctrl-C still
+            # arrives as KeyboardInterrupt.
+            pass
 
+    background_tasks = []
     try:
-        agent_tasks = await system.start()
-
-        monitor_task = asyncio.create_task(monitor_system(system))
+        background_tasks.extend(await system.start())
+        background_tasks.append(asyncio.create_task(monitor_system(system)))
 
         feature_to_process = args.feature
         logger.info(f"Processing feature from CLI arg: {feature_to_process}")
 
         await system.process_feature(feature_to_process)
 
-        while system.running:
-            if not system.coordinator.running:
-                logger.info("🎉 Feature processing completed!")
-                break
-            await asyncio.sleep(1)
+        # The coordinator sets done_event when it stops after finishing.
+        done_wait = asyncio.create_task(system.coordinator.done_event.wait())
+        shutdown_wait = asyncio.create_task(shutdown_requested.wait())
+        try:
+            await asyncio.wait(
+                {done_wait, shutdown_wait}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            done_wait.cancel()
+            shutdown_wait.cancel()
 
-        await system.stop()
+        if not shutdown_requested.is_set():
+            logger.info("🎉 Feature processing completed!")
 
     except KeyboardInterrupt:
         logger.warning("\nReceived keyboard interrupt...")
     finally:
+        # The monitor and run loops use the agents' connections, so they are
+        # stopped before stop() closes them.
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
         await system.stop()
-        await asyncio.sleep(0.1)
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
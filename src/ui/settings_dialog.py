@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-from typing import List, Callable
+from typing import List, Callable, Optional
 from core.config import (
     fetch_available_models,
     get_model_name,
@@ -20,6 +20,7 @@ class SettingsDialog:
         self.model_dropdown = None
         self.refresh_button = None
         self.status_label = None
+        self._refresh_inflight: Optional[threading.Thread] = None
 
     def show(self):
         if self.dialog and self.dialog.winfo_exists():
@@ -123,21 +124,26 @@ Choose the model that best fits your needs. The flash model is faster and more c
         self.dialog.bind("<Return>", lambda e: self._on_save())
         self.dialog.bind("<Escape>", lambda e: self._on_cancel())
 
-    def _load_models(self):
+    def _load_models(self, force_refresh: bool = False):
+        # A fetch is already running; its result will populate the dialog.
+        if self._refresh_inflight and self._refresh_inflight.is_alive():
+            return
+
         self.status_label.config(text="Loading models from API...", foreground="blue")
         self.refresh_button.config(state="disabled")
 
         def load_models_task():
             try:
-                models = fetch_available_models()
+                models = fetch_available_models(force_refresh=force_refresh)
                 self.dialog.after(0, self._on_models_loaded, models, None)
             except Exception as e:
                 self.dialog.after(0, self._on_models_loaded, None, str(e))
 
-        threading.Thread(target=load_models_task, daemon=True).start()
+        self._refresh_inflight = threading.Thread(target=load_models_task, daemon=True)
+        self._refresh_inflight.start()
 
     def _refresh_models(self):
-        self._load_models()
+        self._load_models(force_refresh=True)
 
     def _on_models_loaded(self, models: List[str], error: str):
         self.refresh_button.config(state="normal")